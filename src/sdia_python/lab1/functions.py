@@ -1,13 +1,106 @@
-def is_unique(x):
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+
+def is_unique(x, axis=None, max_items_in_memory=None, n_partitions=64):
     """Check that ``x`` has no duplicate elements.
 
+    The check depends on the type of ``x``:
+
+    - a NumPy array is sorted, and with ``axis`` its slices along ``axis`` (e.g. its rows for ``axis=0``) are compared instead of its elements,
+    - any other iterable, e.g. a list or a generator, is consumed once and the check stops at the first duplicate,
+    - with ``max_items_in_memory``, the elements of an iterable larger than the memory are spilled to ``n_partitions`` temporary files according to their hash, and each partition is checked separately.
+
     Args:
-        x (list): elements to be compared.
+        x (list, iterable or numpy.array): elements to be compared.
+        axis (int, optional): axis of a NumPy array along which slices are compared. Defaults to None, i.e. the elements of the flattened array.
+        max_items_in_memory (int, optional): maximal number of elements kept in memory before spilling to disk. Defaults to None, i.e. no limit.
+        n_partitions (int, optional): number of temporary files used when spilling. Defaults to 64.
 
     Returns:
-        bool: True if ``x`` has duplicate elements, otherwise False
+        bool: True if ``x`` has no duplicate elements, otherwise False
+    """
+    if isinstance(x, np.ndarray):
+        return _is_unique_array(x, axis)
+    if max_items_in_memory is not None:
+        return _is_unique_partitioned(x, max_items_in_memory, n_partitions)
+    return _is_unique_iterable(x)
+
+
+def _hashable(item):
+    """Return a hashable key of ``item``, NumPy arrays being keyed by their content."""
+    if isinstance(item, np.ndarray):
+        return item.dtype.str, item.shape, item.tobytes()
+    return item
+
+
+def _is_unique_array(x, axis):
+    """Check that the elements, or the slices along ``axis``, of the array ``x`` are unique by sorting."""
+    if axis is not None:
+        return np.unique(x, axis=axis).shape[axis] == x.shape[axis]
+    x = np.sort(x, axis=None)
+    return not np.any(x[1:] == x[:-1])
+
+
+def _is_unique_iterable(x):
+    """Check that the elements of the iterable ``x`` are unique, stopping at the first duplicate."""
+    seen = set()
+    for item in x:
+        key = _hashable(item)
+        if key in seen:
+            return False
+        seen.add(key)
+    return True
+
+
+def _is_unique_partitioned(x, max_items_in_memory, n_partitions):
+    """Check that the elements of the iterable ``x`` are unique, spilling them to disk partitioned by hash once more than ``max_items_in_memory`` were seen.
+
+    Equal elements have the same hash hence end up in the same partition, which are checked one at a time.
     """
-    return len(set(x)) == len(x)
+    items = iter(x)
+    seen = set()
+    for item in items:
+        key = _hashable(item)
+        if key in seen:
+            return False
+        seen.add(key)
+        if len(seen) > max_items_in_memory:
+            break
+    else:
+        return True
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, str(k)) for k in range(n_partitions)]
+        files = [open(path, "wb") for path in paths]
+        try:
+            for key in seen:
+                pickle.dump(key, files[hash(key) % n_partitions])
+            del seen
+            for item in items:
+                key = _hashable(item)
+                pickle.dump(key, files[hash(key) % n_partitions])
+        finally:
+            for f in files:
+                f.close()
+
+        for path in paths:
+            with open(path, "rb") as f:
+                if not _is_unique_iterable(_unpickle_all(f)):
+                    return False
+    return True
+
+
+def _unpickle_all(f):
+    """Yield the objects pickled one after the other in the file ``f``."""
+    while True:
+        try:
+            yield pickle.load(f)
+        except EOFError:
+            return
 
 
 def triangle_shape(n, fillchar="x", spacechar=" "):
@@ -37,7 +130,57 @@ def triangle_shape(n, fillchar="x", spacechar=" "):
     Returns:
         str: string representation of the triangle.
     """
-    width = 2 * n - 1
-    return "\n".join(
-        (fillchar * (2 * i + 1)).center(width, spacechar) for i in range(n)
-    )
+    return "\n".join(iter_triangle_shape(n, fillchar, spacechar))
+
+
+def iter_triangle_shape(n, fillchar="x", spacechar=" "):
+    """Yield lazily the rows of the triangle shape of height ``n``, see :py:func:`triangle_shape`.
+
+    The rows are slices of a single buffer made of ``n - 1`` ``spacechar`` followed by ``2n - 1`` ``fillchar``: the i-th row is made of the ``n + i`` characters starting at ``i``, padded with the first ``n - 1 - i`` characters.
+    When ``fillchar`` or ``spacechar`` is not a single character, the rows are centered with :py:meth:`str.center` as in :py:func:`triangle_shape`, which raises a TypeError for such a ``spacechar``.
+
+    Args:
+        n (int): height of the triangle.
+        fillchar (str, optional): Defaults to "x".
+        spacechar (str, optional): Defaults to " ".
+
+    Yields:
+        str: the rows of the triangle, without line break.
+    """
+    if len(fillchar) != 1 or len(spacechar) != 1:
+        width = 2 * n - 1
+        for i in range(n):
+            yield (fillchar * (2 * i + 1)).center(width, spacechar)
+        return
+    buffer = spacechar * (n - 1) + fillchar * (2 * n - 1)
+    for i in range(n):
+        yield buffer[i : n + 2 * i] + buffer[: n - 1 - i]
+
+
+def write_triangle_shape(file, n, fillchar="x", spacechar=" ", buffer_size=2 ** 16):
+    """Write the triangle shape of height ``n`` to the file-like object ``file``, see :py:func:`triangle_shape`.
+
+    The rows are written by blocks of about ``buffer_size`` characters, so that the whole triangle is never held in memory.
+
+    Args:
+        file (file-like object): text file with a ``write`` method.
+        n (int): height of the triangle.
+        fillchar (str, optional): Defaults to "x".
+        spacechar (str, optional): Defaults to " ".
+        buffer_size (int, optional): number of characters written at once. Defaults to 2**16.
+
+    Returns:
+        int: the number of characters written.
+    """
+    block, block_size, written = [], 0, 0
+    for i, row in enumerate(iter_triangle_shape(n, fillchar, spacechar)):
+        if i:
+            row = "\n" + row
+        block.append(row)
+        block_size += len(row)
+        if block_size >= buffer_size:
+            written += file.write("".join(block))
+            block, block_size = [], 0
+    if block:
+        written += file.write("".join(block))
+    return written
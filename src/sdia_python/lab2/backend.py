@@ -0,0 +1,44 @@
+import warnings
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ("numpy", "numba", "auto")
+
+_default_backend = "numpy"
+
+
+def set_backend(backend):
+    """Set the backend used by default by the window methods which accept a ``backend`` argument.
+
+    Args:
+        backend (str): ``"numpy"``, ``"numba"`` or ``"auto"``, which picks ``"numba"`` when it is installed and ``"numpy"`` otherwise.
+    """
+    global _default_backend
+    if backend not in BACKENDS:
+        raise Exception(f"backend must be one of {BACKENDS}")
+    _default_backend = backend
+
+
+def get_backend(backend=None):
+    """Resolve ``backend`` into the implementation to run, ``"numpy"`` or ``"numba"``.
+
+    The ``"numba"`` backend falls back to ``"numpy"`` with a warning when numba is not installed.
+
+    Args:
+        backend (str, optional): ``"numpy"``, ``"numba"`` or ``"auto"``. Defaults to None, i.e. the backend set by :py:func:`set_backend`.
+
+    Returns:
+        str: ``"numpy"`` or ``"numba"``.
+    """
+    backend = backend or _default_backend
+    if backend not in BACKENDS:
+        raise Exception(f"backend must be one of {BACKENDS}")
+    if backend == "auto":
+        return "numpy" if numba is None else "numba"
+    if backend == "numba" and numba is None:
+        warnings.warn("numba is not installed, falling back to the numpy backend")
+        return "numpy"
+    return backend
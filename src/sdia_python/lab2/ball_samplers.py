@@ -0,0 +1,57 @@
+"""Strategies generating points uniformly at random in the unit ball centered at the origin, see :py:meth:`BallWindow.rand <sdia_python.lab2.ball_window.BallWindow.rand>`.
+
+Each strategy takes the number of points ``n``, the dimension ``d`` and a random number generator ``rng``, and returns an array of shape (n, d).
+"""
+
+import math
+
+import numpy as np
+
+# maximal number of candidates drawn at once by rejection
+MAX_BATCH_SIZE = 2 ** 16
+
+
+def gaussian(n, d, rng):
+    """Normalize standard Gaussian vectors, uniform on the sphere, and scale them by U^(1/d) with U uniform on [0, 1]."""
+    points = rng.standard_normal((n, d))
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    points *= rng.random((n, 1)) ** (1 / d)
+    return points
+
+
+def rejection(n, d, rng):
+    """Keep the points of the cube [-1, 1]^d falling in the ball.
+
+    The cube is sampled by vectorized batches over-drawn according to the acceptance rate, the volume ratio of the ball and the cube, and capped to MAX_BATCH_SIZE candidates.
+    The acceptance rate vanishes quickly with the dimension, e.g. 0.0025 for d = 10, so that this strategy is only registered up to d = 3.
+    """
+    acceptance = math.pi ** (d / 2) / math.gamma(d / 2 + 1) / 2 ** d
+    points = np.empty((n, d))
+    filled = 0
+    while filled < n:
+        size = min(int(1.1 * (n - filled) / acceptance) + 16, MAX_BATCH_SIZE)
+        candidates = rng.uniform(-1, 1, size=(size, d))
+        inside = np.einsum("ij,ij->i", candidates, candidates) <= 1
+        candidates = candidates[inside][: n - filled]
+        points[filled : filled + len(candidates)] = candidates
+        filled += len(candidates)
+    return points
+
+
+def polar(n, d, rng):
+    """Use polar coordinates in dimension 1, 2 or 3, with a uniform cosine of the polar angle in dimension 3."""
+    if d == 1:
+        return rng.uniform(-1, 1, size=(n, 1))
+    points = np.empty((n, d))
+    r = rng.random(n) ** (1 / d)
+    theta = rng.uniform(0, 2 * np.pi, size=n)
+    if d == 2:
+        points[:, 0] = r * np.cos(theta)
+        points[:, 1] = r * np.sin(theta)
+        return points
+    cos_phi = rng.uniform(-1, 1, size=n)
+    sin_phi = np.sqrt(1 - cos_phi ** 2)
+    points[:, 0] = r * np.cos(theta) * sin_phi
+    points[:, 1] = r * np.sin(theta) * sin_phi
+    points[:, 2] = r * cos_phi
+    return points
@@ -1,25 +1,55 @@
+import math
+import sys
+import time
+
 import numpy as np
+from scipy.special import betainc
+
+from sdia_python.lab2 import ball_samplers
+from sdia_python.lab2.backend import get_backend
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.composite import EmptyWindow, WindowSetOperations
+from sdia_python.lab2.qmc import sample_unit_cube, unit_cube_to_ball
+from sdia_python.lab2.utils import (
+    Immutable,
+    get_random_number_generator,
+    read_only_copy,
+)
+
 
-from sdia_python.lab2.utils import get_random_number_generator
+class BallWindow(Immutable, WindowSetOperations):
+    """This class represents a ball of any dimension
 
+    Balls can be combined with the operators ``&``, ``|`` and ``-``, see :py:class:`~sdia_python.lab2.composite.WindowSetOperations`.
+    Balls are immutable: they store a read-only copy of their center and compute their dimension, squared radius and volume once. They are hashable and compared by value.
+    """
+
+    __slots__ = ("center", "radius", "radius_squared", "_dimension", "_volume")
 
-class BallWindow:
-    """This class represents a ball of dimension one, two or three"""
+    # name -> (strategy sampling the unit ball, maximal dimension or None)
+    samplers = {
+        "gaussian": (ball_samplers.gaussian, None),
+        "rejection": (ball_samplers.rejection, 3),
+        "polar": (ball_samplers.polar, 3),
+    }
+    # (dimension, number of points) -> name of the fastest sampler
+    _calibration = {}
 
     def __init__(self, center, radius=1):
         """Constructor of the class : build a ball whose dimension is given by the size of the center array and the radius by the float radius.
 
         Args:
-            center (numpy.array): an array containing the coordinates of the    center. It must be of length <= 3.
+            center (numpy.array): an array containing the coordinates of the center.
             radius (float): the radius of the ball.
         """
         assert isinstance(center, np.ndarray)
         if radius < 0:
             raise Exception("radius must be positive")
-        if len(center) > 3:
-            raise Exception("Dimension is too high")
-        self.center = center
-        self.radius = radius
+        self._set("center", read_only_copy(center))
+        self._set("radius", radius)
+        self._set("radius_squared", radius ** 2)
+        self._set("_dimension", len(center))
+        self._set("_volume", self._compute_volume())
 
     def __str__(self):
         """Returns for example the following string :
@@ -40,7 +70,30 @@ class BallWindow:
             boolean: True if the ball contains the point given in argument
         """
         assert len(point) == len(self.center)
-        return np.all(np.linalg.norm(self.center - point) <= self.radius)
+        return bool(self.indicator_function(point))
+
+    def __eq__(self, other):
+        """Returns True if ``other`` is a ball with the same center and radius.
+
+        Args:
+            other (object): the object to compare with.
+
+        Returns:
+            bool: True if both balls have the same center and radius
+        """
+        if not isinstance(other, BallWindow):
+            return NotImplemented
+        return self.radius == other.radius and np.array_equal(self.center, other.center)
+
+    def __hash__(self):
+        """Returns a hash of the center and radius, consistent with :py:meth:`__eq__`.
+
+        Returns:
+            int: the hash of the ball
+        """
+        # + 0.0 turns -0.0 into 0.0 which compares equal
+        center = (self.center.astype(float) + 0.0).tobytes()
+        return hash((BallWindow, center, self.radius))
 
     def dimension(self):
         """Returns the dimension of the ball.
@@ -48,63 +101,263 @@ class BallWindow:
         Returns:
             int: the dimension of the ball
         """
-        return len(self.center)
+        return self._dimension
 
     def volume(self):
-        """Returns the volume of the box
+        """Returns the volume of the ball, given by the closed-form formula pi^(d/2) * r^d / Gamma(d/2 + 1).
 
         Returns:
-            float: Returns the volume of the box
+            float: Returns the volume of the ball
         """
-        n = self.dimension()
-        if n == 1:
-            return 2 * self.radius
-        if n == 2:
-            return np.pi * self.radius ** 2
-        return (4 / 3) * np.pi * self.radius ** 3
+        return self._volume
 
-    def indicator_function(self, point):
-        """Return True if the ball contains the point given in argument.
+    def _compute_volume(self):
+        """Computes the volume of the ball, cached by the constructor."""
+        d = self.dimension()
+        # a NumPy scalar radius would wrap around or overflow to inf without raising
+        radius = float(self.radius)
+        try:
+            return math.pi ** (d / 2) / math.gamma(d / 2 + 1) * radius ** d
+        except OverflowError:
+            log_volume = self.log_volume()
+            if log_volume >= math.log(sys.float_info.max):
+                return math.inf
+            return math.exp(log_volume)
+
+    def log_volume(self):
+        """Returns the logarithm of the volume of the ball, which remains numerically stable in high dimension where the volume itself underflows or overflows.
+
+        Returns:
+            float: Returns the logarithm of the volume of the ball
+        """
+        d = self.dimension()
+        if self.radius == 0:
+            return -math.inf
+        return (
+            d / 2 * math.log(math.pi)
+            - math.lgamma(d / 2 + 1)
+            + d * math.log(self.radius)
+        )
+
+    def bounding_box(self):
+        """Returns the smallest box containing the ball.
+
+        Returns:
+            BoxWindow: the box [c_1 - r, c_1 + r] x ... x [c_d - r, c_d + r]
+        """
+        return BoxWindow(np.add.outer(self.center, [-self.radius, self.radius]))
+
+    def indicator_function(self, points, chunk_size=65536, backend=None):
+        """Return True if the ball contains the point given in argument, or the corresponding boolean mask for an array of points.
+
+        Squared distances to the center are compared to the squared radius, so that no square root is computed. Large arrays of points are processed by chunks of ``chunk_size`` rows to bound the size of the temporary arrays.
 
         Args:
-            point (numpy.array): a point represented by a numpy array of same size that the center.
+            points (numpy.array): a point of same size that the center, or an array of points of shape (N, d).
+            chunk_size (int, optional): number of points processed at once. Defaults to 65536.
+            backend (str, optional): ``"numpy"``, ``"numba"`` or ``"auto"``, see :py:func:`~sdia_python.lab2.backend.get_backend`. The numba kernel needs no chunking. Defaults to None.
 
         Returns:
-            boolean: True if the ball contains the point given in argument
+            boolean or numpy.array: True if the ball contains the point given in argument, or the boolean mask of shape (N,) if an array of points is given.
+        """
+        points = np.asarray(points)
+        assert points.shape[-1] == len(self.center)
+        if points.ndim == 1:
+            return bool(self.indicator_function(points[None, :], backend=backend)[0])
+        mask = np.empty(len(points), dtype=bool)
+        if get_backend(backend) == "numba":
+            from sdia_python.lab2 import numba_kernels
+
+            center = self.center.astype(float)
+            return numba_kernels.ball_indicator_function(
+                points, center, self.radius_squared, mask
+            )
+        for start in range(0, len(points), chunk_size):
+            diff = points[start : start + chunk_size] - self.center
+            np.less_equal(
+                np.einsum("ij,ij->i", diff, diff),
+                self.radius_squared,
+                out=mask[start : start + chunk_size],
+            )
+        return mask
+
+    def signed_distance(self, points):
+        """Returns the signed Euclidean distance of the point to the sphere bounding the ball, negative inside the ball and positive outside, or the distances of an array of points.
+
+        Args:
+            points (numpy.array): a single point of shape (d,) or an array of points of shape (N, d).
+
+        Returns:
+            float or numpy.array: the signed distance of the point, or the array of shape (N,) of the signed distances if an array of points is given.
+        """
+        points = np.asarray(points)
+        assert points.shape[-1] == len(self.center)
+        if points.ndim == 1:
+            return float(self.signed_distance(points[None, :])[0])
+        diff = points - self.center
+        return np.sqrt(np.einsum("ij,ij->i", diff, diff)) - self.radius
+
+    def dilate(self, r):
+        """Returns the points at distance at most ``r`` of the ball, i.e. the concentric ball of radius ``radius + r``, or the eroded ball if ``r`` is negative.
+
+        Args:
+            r (float): the distance by which the ball is grown.
+
+        Returns:
+            BallWindow: the grown ball, or an EmptyWindow if the ball is shrunk by more than its radius.
+        """
+        if self.radius + r < 0:
+            return EmptyWindow(self.dimension())
+        return BallWindow(self.center, self.radius + r)
+
+    def erode(self, r):
+        """Returns the points of the ball at distance at least ``r`` of its boundary, i.e. the concentric ball of radius ``radius - r``, see :py:meth:`dilate`.
+
+        Args:
+            r (float): the distance by which the ball is shrunk.
+
+        Returns:
+            BallWindow: the shrunk ball, or an EmptyWindow if ``r`` is larger than the radius.
+        """
+        return self.dilate(-r)
+
+    def overlap_volume(self, shifts):
+        """Returns the volume of the intersection of the ball B with its translations B + h, for an array of shifts h.
+
+        The intersection is made of two spherical caps of height r - |h| / 2, whose volume is given by the regularized incomplete beta function: |B| * I_{1 - (|h| / 2r)^2}((d + 1) / 2, 1 / 2).
+
+        Args:
+            shifts (numpy.array): a single shift of shape (d,) or an array of shifts of shape (N, d).
+
+        Returns:
+            float or numpy.array: the volume of the intersection, or the array of shape (N,) of the volumes if an array of shifts is given.
         """
-        return self.__contains__(point)
+        shifts = np.asarray(shifts)
+        assert shifts.shape[-1] == len(self.center)
+        if self.radius == 0:
+            return np.zeros(shifts.shape[:-1])[()]
+        t = np.linalg.norm(shifts, axis=-1) / (2 * self.radius)
+        x = np.maximum(1 - t ** 2, 0)
+        return self.volume() * betainc((self.dimension() + 1) / 2, 0.5, x)
+
+    @classmethod
+    def register_sampler(cls, name, sampler, max_dimension=None):
+        """Register a strategy to sample the unit ball, usable with ``BallWindow.rand(sampler=name)``.
 
-    def rand(self, n=1, rng=None):
+        Args:
+            name (str): name of the strategy.
+            sampler (callable): function ``sampler(n, d, rng)`` returning an array of shape (n, d) of points uniformly distributed in the unit ball.
+            max_dimension (int, optional): maximal dimension supported by the strategy. Defaults to None, i.e. any dimension.
+        """
+        cls.samplers[name] = (sampler, max_dimension)
+
+    @classmethod
+    def available_samplers(cls, d):
+        """Returns the names of the samplers supporting the dimension ``d``.
+
+        Args:
+            d (int): the dimension.
+
+        Returns:
+            list: names of the samplers.
+        """
+        return [
+            name
+            for name, (_, max_dimension) in cls.samplers.items()
+            if max_dimension is None or d <= max_dimension
+        ]
+
+    @classmethod
+    def calibrate_samplers(
+        cls, dimensions=(1, 2, 3, 5, 10), sizes=(10 ** 3, 10 ** 5), repeat=3
+    ):
+        """Time each sampler on this host and record the fastest one for each dimension and number of points, used afterwards by ``rand(sampler="auto")``.
+
+        Args:
+            dimensions (tuple, optional): dimensions to calibrate. Defaults to (1, 2, 3, 5, 10).
+            sizes (tuple, optional): numbers of points to calibrate. Defaults to (10**3, 10**5).
+            repeat (int, optional): number of timed runs, the best one is kept. Defaults to 3.
+
+        Returns:
+            dict: ``{(d, n): name}`` of the fastest samplers.
+        """
+        rng = get_random_number_generator(0)
+        for d in dimensions:
+            for n in sizes:
+                timings = {}
+                for name in cls.available_samplers(d):
+                    sampler = cls.samplers[name][0]
+                    best = math.inf
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        sampler(n, d, rng)
+                        best = min(best, time.perf_counter() - start)
+                    timings[name] = best
+                cls._calibration[(d, n)] = min(timings, key=timings.get)
+        return dict(cls._calibration)
+
+    @classmethod
+    def select_sampler(cls, d, n):
+        """Returns the name of the sampler expected to be the fastest to draw n points in dimension d.
+
+        The closest calibrated setting is used, see :py:meth:`calibrate_samplers`, and without calibration rejection sampling is chosen for d <= 3 and Gaussian normalization otherwise.
+
+        Args:
+            d (int): the dimension.
+            n (int): the number of points.
+
+        Returns:
+            str: name of the sampler.
+        """
+        available = cls.available_samplers(d)
+        candidates = [
+            (abs(d_ - d), abs(math.log(n_) - math.log(max(n, 1))), name)
+            for (d_, n_), name in cls._calibration.items()
+            if name in available
+        ]
+        if candidates:
+            return min(candidates)[2]
+        return "rejection" if d <= 3 else "gaussian"
+
+    def rand(self, n=1, rng=None, backend=None, method="random", sampler="gaussian"):
         """Generate n points uniformly at random inside the BallWindow.
 
+        The points of the unit ball are drawn by the strategy ``sampler`` registered in :py:attr:`samplers`, then scaled by the radius and shifted by the center.
+        The default ``"gaussian"`` strategy normalizes standard Gaussian vectors, which are uniformly distributed on the sphere, and draws the distances to the center as r * U^(1/d) with U uniform on [0, 1].
+        With a quasi-Monte Carlo ``method``, points of the unit cube of dimension d + 1 given by :py:func:`~sdia_python.lab2.qmc.sample_unit_cube` are mapped to the ball by :py:func:`~sdia_python.lab2.qmc.unit_cube_to_ball`.
+
         Args:
             n (int, optional): Number of points. Defaults to 1.
             rng ((numpy.random._generator.Generator, optional): Random number generator. Defaults to None.
+            backend (str, optional): ``"numpy"``, ``"numba"`` or ``"auto"``, see :py:func:`~sdia_python.lab2.backend.get_backend`, the numba kernel implements the ``"gaussian"`` strategy. Defaults to None.
+            method (str, optional): ``"random"``, ``"sobol"``, ``"halton"`` or ``"lhs"``. Defaults to "random".
+            sampler (str, optional): ``"gaussian"``, ``"rejection"``, ``"polar"``, another registered strategy, or ``"auto"`` to use :py:meth:`select_sampler`. Defaults to "gaussian".
 
         Returns:
-            list: A list of n points generated uniformly at random inside the BallWindow.
+            numpy.array: An array of shape (n, d) of points generated uniformly at random inside the BallWindow.
         """
         rng = get_random_number_generator(rng)
         d = self.dimension()
-        if d == 1:
-            points = rng.uniform(
-                self.center[0] - self.radius, self.center[0] + self.radius, size=n
-            )
-            return points
-        if d == 2:
-            points = np.zeros((n, 2))
-            r = np.sqrt(rng.uniform(0, 1, size=n)) * self.radius
-            theta = rng.uniform(0, 2 * np.pi, size=n)
-            points[:, 0] = r * np.cos(theta) + self.center[0]
-            points[:, 1] = r * np.sin(theta) + self.center[1]
-            return points
-        points = np.zeros((n, 3))
-        r = np.cbrt(rng.uniform(0, 1, size=n)) * self.radius
-        theta = rng.uniform(0, 2 * np.pi, size=n)
-        phi = rng.uniform(0, np.pi, size=n)
-        points[:, 0] = r * np.cos(theta) * np.sin(phi) + self.center[0]
-        points[:, 1] = r * np.sin(theta) * np.sin(phi) + self.center[1]
-        points[:, 2] = r * np.cos(phi) + self.center[2]
+        if method != "random":
+            points = unit_cube_to_ball(sample_unit_cube(n, d + 1, method, rng))
+        else:
+            if sampler == "auto":
+                sampler = self.select_sampler(d, n)
+            if sampler == "gaussian" and get_backend(backend) == "numba":
+                from sdia_python.lab2 import numba_kernels
+
+                points = rng.standard_normal((n, d))
+                center = self.center.astype(float)
+                u = rng.random(n)
+                return numba_kernels.ball_scale(points, u, center, float(self.radius))
+            function, max_dimension = self.samplers[sampler]
+            if max_dimension is not None and d > max_dimension:
+                raise Exception(
+                    f"The {sampler} sampler is limited to dimension {max_dimension}"
+                )
+            points = function(n, d, rng)
+        points *= self.radius
+        points += self.center
         return points
 
 
@@ -112,6 +365,8 @@ class UnitBallWindow(BallWindow):
     """Represent a BallWindow where the radius has a size of one.
     """
 
+    __slots__ = ()
+
     def __init__(self, center):
         """Return a BallWindow where the radius is equal to one.
 
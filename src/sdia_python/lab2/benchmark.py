@@ -0,0 +1,195 @@
+"""Benchmarks of the window classes and sampling utilities.
+
+Measure the throughput (points or calls per second) and the peak memory of ``rand``, ``indicator_function``, ``__contains__``, ``volume`` and ``get_random_number_generator`` over a sweep of sizes and dimensions.
+
+.. code-block:: sh
+
+    # record a baseline
+    python -m sdia_python.lab2.benchmark --output baseline.json
+    # fail (exit code 1) if a metric regressed by more than 20%
+    python -m sdia_python.lab2.benchmark --baseline baseline.json --threshold 0.2
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from sdia_python.lab2.ball_window import BallWindow, UnitBallWindow
+from sdia_python.lab2.box_window import BoxWindow, UnitBoxWindow
+from sdia_python.lab2.utils import get_random_number_generator
+
+WINDOWS = {
+    "BoxWindow": lambda d: BoxWindow(np.column_stack([-np.ones(d), 2 * np.ones(d)])),
+    "BallWindow": lambda d: BallWindow(np.zeros(d), 2),
+    "UnitBoxWindow": lambda d: UnitBoxWindow(np.zeros(d)),
+    "UnitBallWindow": lambda d: UnitBallWindow(np.zeros(d)),
+}
+
+# __contains__, volume and get_random_number_generator are called once per point,
+# they are only timed on the first points
+N_CONTAINS_MAX = 1000
+
+
+# each operation prepares its inputs, e.g. the query points, and returns the function
+# timed by _measure, which returns the number of points or calls processed
+
+
+def _bench_rand(window, n, rng):
+    def run():
+        window.rand(n, rng=rng)
+        return n
+
+    return run
+
+
+def _bench_indicator_function(window, n, rng):
+    points = rng.uniform(-2, 2, size=(n, window.dimension()))
+
+    def run():
+        window.indicator_function(points)
+        return n
+
+    return run
+
+
+def _bench_contains(window, n, rng):
+    points = rng.uniform(-2, 2, size=(min(n, N_CONTAINS_MAX), window.dimension()))
+
+    def run():
+        for point in points:
+            point in window
+        return len(points)
+
+    return run
+
+
+def _bench_volume(window, n, rng):
+    def run():
+        for _ in range(min(n, N_CONTAINS_MAX)):
+            window.volume()
+        return min(n, N_CONTAINS_MAX)
+
+    return run
+
+
+def _bench_get_random_number_generator(n):
+    for seed in range(min(n, N_CONTAINS_MAX)):
+        get_random_number_generator(seed)
+    return min(n, N_CONTAINS_MAX)
+
+
+OPERATIONS = {
+    "rand": _bench_rand,
+    "indicator_function": _bench_indicator_function,
+    "__contains__": _bench_contains,
+    "volume": _bench_volume,
+}
+
+
+def _measure(function, repeat):
+    """Returns the best throughput of ``function`` over ``repeat`` runs, and its peak memory in bytes."""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = function()
+        elapsed = time.perf_counter() - start
+        best = max(best, count / elapsed if elapsed > 0 else float("inf"))
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"throughput": best, "peak_memory": peak}
+
+
+def run_benchmarks(sizes=(10 ** 3, 10 ** 5), dimensions=(2, 10), repeat=3, seed=0):
+    """Run every operation on every window class for each size and dimension.
+
+    Args:
+        sizes (tuple, optional): numbers of points. Defaults to (10**3, 10**5).
+        dimensions (tuple, optional): dimensions of the windows. Defaults to (2, 10).
+        repeat (int, optional): number of timed runs, the best one is kept. Defaults to 3.
+        seed (int, optional): seed of the random number generator. Defaults to 0.
+
+    Returns:
+        dict: ``{name: {"throughput": points/s, "peak_memory": bytes}}`` where name is e.g. ``"BoxWindow.rand[n=1000,d=2]"``.
+    """
+    rng = get_random_number_generator(seed)
+    results = {}
+    for window_name, make_window in WINDOWS.items():
+        for d in dimensions:
+            window = make_window(d)
+            for operation_name, operation in OPERATIONS.items():
+                for n in sizes:
+                    name = f"{window_name}.{operation_name}[n={n},d={d}]"
+                    results[name] = _measure(operation(window, n, rng), repeat=repeat)
+    for n in sizes:
+        results[f"get_random_number_generator[n={n}]"] = _measure(
+            lambda: _bench_get_random_number_generator(n), repeat=repeat
+        )
+    return results
+
+
+def compare(results, baseline, threshold=0.2):
+    """Compare benchmark results to a baseline.
+
+    Args:
+        results (dict): output of :py:func:`run_benchmarks`.
+        baseline (dict): previous output of :py:func:`run_benchmarks`.
+        threshold (float, optional): tolerated relative regression. Defaults to 0.2.
+
+    Returns:
+        list: messages describing the metrics that regressed beyond ``threshold``, empty if none.
+    """
+    regressions = []
+    for name, reference in baseline.items():
+        if name not in results:
+            continue
+        current = results[name]
+        if current["throughput"] < (1 - threshold) * reference["throughput"]:
+            regressions.append(
+                f"{name}: throughput {current['throughput']:.3g} < {reference['throughput']:.3g} points/s"
+            )
+        if current["peak_memory"] > (1 + threshold) * reference["peak_memory"]:
+            regressions.append(
+                f"{name}: peak memory {current['peak_memory']} > {reference['peak_memory']} bytes"
+            )
+    return regressions
+
+
+def main(argv=None):
+    """Command line entry point, returns the exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10 ** 3, 10 ** 5])
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[2, 10])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="JSON file where the results are saved")
+    parser.add_argument("--baseline", help="JSON file of results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.dimensions, args.repeat)
+    for name, metrics in results.items():
+        print(
+            f"{name:<55} {metrics['throughput']:>12.4g} /s {metrics['peak_memory']:>12} B"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for message in regressions:
+            print("REGRESSION", message)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,23 @@
 import numpy as np
 
-from sdia_python.lab2.utils import get_random_number_generator
+from sdia_python.lab2.backend import get_backend
+from sdia_python.lab2.composite import EmptyWindow, WindowSetOperations
+from sdia_python.lab2.qmc import sample_unit_cube
+from sdia_python.lab2.utils import (
+    Immutable,
+    get_random_number_generator,
+    read_only_copy,
+)
 
 
-class BoxWindow:
-    """Representation of a box defines by [a1,b1] x [a2,b2] x ..."""
+class BoxWindow(Immutable, WindowSetOperations):
+    """Representation of a box defines by [a1,b1] x [a2,b2] x ...
+
+    Boxes can be combined with the operators ``&``, ``|`` and ``-``, see :py:class:`~sdia_python.lab2.composite.WindowSetOperations`.
+    Boxes are immutable: they store a read-only copy of their bounds and compute their volume, center and widths once. They are hashable and compared by value.
+    """
+
+    __slots__ = ("bounds", "_widths", "_volume", "_center")
 
     def __init__(self, bounds):
         """Constructor of a BoxWIndow
@@ -18,7 +31,10 @@ class BoxWindow:
             raise Exception("The dimension of the argument bounds is not correct")
         if not np.all(np.diff(bounds) >= 0):
             raise Exception("The bounds are not in the right order")
-        self.bounds = bounds
+        self._set("bounds", read_only_copy(bounds))
+        self._set("_widths", read_only_copy(np.diff(bounds)[:, 0]))
+        self._set("_volume", np.prod(np.diff(bounds)))
+        self._set("_center", read_only_copy(np.sum(bounds, axis=1) / 2))
 
     def __str__(self):
         """Returns the representation of a box, for example the following string :
@@ -32,6 +48,28 @@ class BoxWindow:
         sep = " x "
         return s + sep.join(bounds_list)
 
+    def __eq__(self, other):
+        """Returns True if ``other`` is a box with the same bounds.
+
+        Args:
+            other (object): the object to compare with.
+
+        Returns:
+            bool: True if both boxes have the same bounds
+        """
+        if not isinstance(other, BoxWindow):
+            return NotImplemented
+        return np.array_equal(self.bounds, other.bounds)
+
+    def __hash__(self):
+        """Returns a hash of the bounds, consistent with :py:meth:`__eq__`.
+
+        Returns:
+            int: the hash of the box
+        """
+        # + 0.0 turns -0.0 into 0.0 which compares equal
+        return hash((BoxWindow, (self.bounds.astype(float) + 0.0).tobytes()))
+
     def __len__(self):
         """Returns the len of the box, ie the dimension.
 
@@ -50,7 +88,47 @@ class BoxWindow:
             Boolean: True if the point belongs to the box
         """
         assert len(point) == self.dimension()
-        return all(a <= x <= b for (a, b), x in zip(self.bounds, point))
+        return bool(self.indicator_function(point))
+
+    def __and__(self, other):
+        """Returns the intersection of the box with another window, in closed form if the other window is a box.
+
+        Args:
+            other (object): a window of the same dimension.
+
+        Returns:
+            object: a BoxWindow, or an EmptyWindow if the boxes are disjoint, or a lazy IntersectionWindow otherwise.
+        """
+        if not isinstance(other, BoxWindow):
+            return super().__and__(other)
+        assert self.dimension() == other.dimension()
+        lower = np.maximum(self.bounds[:, 0], other.bounds[:, 0])
+        upper = np.minimum(self.bounds[:, 1], other.bounds[:, 1])
+        if np.any(lower > upper):
+            return EmptyWindow(self.dimension())
+        return BoxWindow(np.column_stack([lower, upper]))
+
+    def hull(self, other):
+        """Returns the smallest box containing the box and another box.
+
+        Args:
+            other (BoxWindow): a box of the same dimension.
+
+        Returns:
+            BoxWindow: the smallest box containing both boxes.
+        """
+        assert self.dimension() == other.dimension()
+        lower = np.minimum(self.bounds[:, 0], other.bounds[:, 0])
+        upper = np.maximum(self.bounds[:, 1], other.bounds[:, 1])
+        return BoxWindow(np.column_stack([lower, upper]))
+
+    def bounding_box(self):
+        """Returns the smallest box containing the box, ie the box itself.
+
+        Returns:
+            BoxWindow: the box itself
+        """
+        return self
 
     def dimension(self):
         """Returns the dimension of the box, ie the number of segment.
@@ -66,18 +144,102 @@ class BoxWindow:
         Returns:
             int: the volume of the box
         """
-        return np.prod(np.diff(self.bounds))
+        return self._volume
 
-    def indicator_function(self, points):
-        """Returns True if the point belongs to the box
+    def widths(self):
+        """Returns the length of the segment of the box along each dimension.
+
+        Returns:
+            numpy array: the widths b_i - a_i of the box.
+        """
+        return self._widths
+
+    def indicator_function(self, points, out=None, backend=None):
+        """Returns True if the point belongs to the box, or the corresponding boolean mask for an array of points.
+
+        The membership test is computed with broadcast comparisons against the lower and upper bounds of the box, the boundary being included.
 
         Args:
-            point (numpy.array): the point
+            points (numpy.array): a single point of shape (d,) or an array of points of shape (N, d).
+            out (numpy.array, optional): preallocated boolean array of shape (N,) where the mask is stored. Defaults to None.
+            backend (str, optional): ``"numpy"``, ``"numba"`` or ``"auto"``, see :py:func:`~sdia_python.lab2.backend.get_backend`. Defaults to None.
+
+        Returns:
+            boolean or numpy.array: True if the point belongs to the box, or the boolean mask of shape (N,) if an array of points is given.
+        """
+        points = np.asarray(points)
+        assert points.shape[-1] == self.dimension()
+        a, b = self.bounds[:, 0], self.bounds[:, 1]
+        if points.ndim == 1:
+            return bool(np.all((a <= points) & (points <= b)))
+        if out is None:
+            out = np.empty(len(points), dtype=bool)
+        if get_backend(backend) == "numba":
+            from sdia_python.lab2 import numba_kernels
+
+            return numba_kernels.box_indicator_function(points, a, b, out)
+        return np.all((a <= points) & (points <= b), axis=1, out=out)
+
+    def signed_distance(self, points):
+        """Returns the signed Euclidean distance of the point to the boundary of the box, negative inside the box and positive outside, or the distances of an array of points.
+
+        Args:
+            points (numpy.array): a single point of shape (d,) or an array of points of shape (N, d).
+
+        Returns:
+            float or numpy.array: the signed distance of the point, or the array of shape (N,) of the signed distances if an array of points is given.
+        """
+        points = np.asarray(points)
+        assert points.shape[-1] == self.dimension()
+        if points.ndim == 1:
+            return float(self.signed_distance(points[None, :])[0])
+        # distances to the faces along each axis, negative inside the slab
+        q = np.abs(points - self._center) - self._widths / 2
+        outside = np.linalg.norm(np.maximum(q, 0), axis=1)
+        inside = np.minimum(q.max(axis=1), 0)
+        return outside + inside
+
+    def erode(self, r):
+        """Returns the points of the box at distance at least ``r`` of its boundary, i.e. the box shrunk by ``r`` in every direction.
+
+        Args:
+            r (float): the distance by which the box is shrunk, nonnegative, see :py:meth:`dilated_bounding_box` to grow the box.
 
         Returns:
-            boolean: True if the point belongs to the box
+            BoxWindow: the shrunk box, or an EmptyWindow if ``r`` is larger than half the smallest width of the box.
         """
-        return self.__contains__(points)
+        assert r >= 0
+        bounds = self.bounds + np.array([r, -r])
+        if np.any(bounds[:, 0] > bounds[:, 1]):
+            return EmptyWindow(self.dimension())
+        return BoxWindow(bounds)
+
+    def dilated_bounding_box(self, r):
+        """Returns the box grown by ``r`` in every direction, i.e. the smallest box containing the points at distance at most ``r`` of the box.
+
+        This is not the dilation of the box by a ball of radius ``r``, whose corners are rounded: near the corners, the returned box contains points whose :py:meth:`signed_distance` is larger than ``r``.
+
+        Args:
+            r (float): the distance by which the box is grown, nonnegative.
+
+        Returns:
+            BoxWindow: the grown box.
+        """
+        assert r >= 0
+        return BoxWindow(self.bounds + np.array([-r, r]))
+
+    def overlap_volume(self, shifts):
+        """Returns the volume of the intersection of the box W with its translations W + h, for an array of shifts h.
+
+        Args:
+            shifts (numpy.array): a single shift of shape (d,) or an array of shifts of shape (N, d).
+
+        Returns:
+            float or numpy.array: the volume prod_i max(w_i - |h_i|, 0), or the array of shape (N,) of the volumes if an array of shifts is given.
+        """
+        shifts = np.asarray(shifts)
+        assert shifts.shape[-1] == self.dimension()
+        return np.prod(np.maximum(self._widths - np.abs(shifts), 0), axis=-1)
 
     def center(self):
         """Return the array with the coordinates of the center of the box.
@@ -85,28 +247,51 @@ class BoxWindow:
         Returns:
             numpy array: The array with the coordinates of the center of the box.
         """
-        return np.sum(self.bounds, axis=1) / 2
+        return self._center
 
-    def rand(self, n=1, rng=None):
+    def rand(
+        self, n=1, rng=None, dtype=np.float64, out=None, backend=None, method="random"
+    ):
         """Generate n points uniformly at random inside the BoxWindow.
 
+        All the coordinates are drawn at once in the unit cube, then scaled by the widths of the box and shifted by its lower bounds.
+        With a quasi-Monte Carlo ``method``, the points of the unit cube are given by :py:func:`~sdia_python.lab2.qmc.sample_unit_cube`, scrambled with ``rng``.
+
         Args:
             n (int, optional): the number of points. Defaults to 1.
             rng (numpy.random._generator.Generator, optional): Random number generator. Defaults to None.
+            dtype (numpy.dtype, optional): ``numpy.float32`` or ``numpy.float64``. Defaults to numpy.float64.
+            out (numpy.array, optional): preallocated array of shape (n, d) where the points are stored, its dtype overrides ``dtype``. Defaults to None.
+            backend (str, optional): ``"numpy"``, ``"numba"`` or ``"auto"``, see :py:func:`~sdia_python.lab2.backend.get_backend`. Defaults to None.
+            method (str, optional): ``"random"``, ``"sobol"``, ``"halton"`` or ``"lhs"``. Defaults to "random".
 
         Returns:
-            A list of n points generated uniformly at random inside the BoxWindow.
+            numpy.array: An array of shape (n, d) of points generated uniformly at random inside the BoxWindow.
         """
         rng = get_random_number_generator(rng)
-        points = np.array(
-            [[rng.uniform(a, b) for a, b in self.bounds] for i in range(n)]
-        )
-        return points
+        if out is None:
+            out = np.empty((n, self.dimension()), dtype=dtype)
+        assert out.shape == (n, self.dimension())
+        if method == "random":
+            rng.random(out=out, dtype=out.dtype)
+        else:
+            out[:] = sample_unit_cube(n, self.dimension(), method, rng)
+        lower = self.bounds[:, 0].astype(out.dtype)
+        widths = self._widths.astype(out.dtype, copy=False)
+        if get_backend(backend) == "numba":
+            from sdia_python.lab2 import numba_kernels
+
+            return numba_kernels.box_scale(out, lower, widths)
+        out *= widths
+        out += lower
+        return out
 
 
 class UnitBoxWindow(BoxWindow):
     """Represent a BoxWindow where all the segment over all dimensions have a size of one."""
 
+    __slots__ = ()
+
     def __init__(self, center):
         """Returns a unit box window, with segments of length 1 for each dimension, centered on args if the center is precised, else, it is centered on (0,0,...,0).
 
@@ -0,0 +1,262 @@
+import numpy as np
+
+from sdia_python.lab2.monte_carlo import estimate_volume
+from sdia_python.lab2.utils import get_random_number_generator
+
+
+class WindowSetOperations:
+    """Mixin providing the operators ``&`` (intersection), ``|`` (union) and ``-`` (difference) on windows.
+
+    The operators build a lazy expression tree of :py:class:`IntersectionWindow`, :py:class:`UnionWindow` and :py:class:`DifferenceWindow`, simplified when one of the operands is an :py:class:`EmptyWindow`.
+    A window using this mixin must provide ``dimension``, ``indicator_function``, ``volume`` and ``bounding_box`` methods.
+    """
+
+    __slots__ = ()
+
+    def __and__(self, other):
+        """Returns the intersection of the two windows."""
+        assert self.dimension() == other.dimension()
+        if isinstance(self, EmptyWindow) or isinstance(other, EmptyWindow):
+            return EmptyWindow(self.dimension())
+        return IntersectionWindow(self, other)
+
+    def __or__(self, other):
+        """Returns the union of the two windows."""
+        assert self.dimension() == other.dimension()
+        if isinstance(other, EmptyWindow):
+            return self
+        if isinstance(self, EmptyWindow):
+            return other
+        return UnionWindow(self, other)
+
+    def __sub__(self, other):
+        """Returns the points of the first window which do not belong to the second one."""
+        assert self.dimension() == other.dimension()
+        if isinstance(self, EmptyWindow) or isinstance(other, EmptyWindow):
+            return self
+        return DifferenceWindow(self, other)
+
+
+class EmptyWindow(WindowSetOperations):
+    """Represent the empty set, e.g. the intersection of two disjoint boxes."""
+
+    def __init__(self, dimension):
+        """Constructor of an empty window of dimension ``dimension``.
+
+        Args:
+            dimension (int): the dimension of the ambient space.
+        """
+        self._dimension = dimension
+
+    def __str__(self):
+        """Returns the representation of the empty window, for example "EmptyWindow: dimension = 2"."""
+        return f"EmptyWindow: dimension = {self._dimension}"
+
+    def __contains__(self, point):
+        """Returns False, no point belongs to the empty window."""
+        assert len(point) == self.dimension()
+        return False
+
+    def dimension(self):
+        """Returns the dimension of the ambient space."""
+        return self._dimension
+
+    def volume(self):
+        """Returns 0, the volume of the empty window."""
+        return 0.0
+
+    def bounding_box(self):
+        """Returns the empty window itself."""
+        return self
+
+    def indicator_function(self, points):
+        """Returns False for a single point, or a mask of False for an array of points."""
+        points = np.asarray(points)
+        assert points.shape[-1] == self.dimension()
+        if points.ndim == 1:
+            return False
+        return np.zeros(len(points), dtype=bool)
+
+    def rand(self, n=1, rng=None):
+        """Raises an Exception, no point can be sampled in the empty window."""
+        raise Exception("Cannot sample points in an empty window")
+
+
+class CompositeWindow(WindowSetOperations):
+    """Base class of the lazy combination of two windows ``left`` and ``right``."""
+
+    symbol = None
+    # evaluate the right operand where the left mask is True, otherwise where it is False
+    evaluate_right_inside = True
+    # the mask of the right operand is negated, e.g. for a difference
+    negate_right = False
+
+    def __init__(self, left, right):
+        """Constructor of a composite window, see :py:class:`WindowSetOperations`.
+
+        Args:
+            left (object): the left operand.
+            right (object): the right operand.
+        """
+        self.left = left
+        self.right = right
+
+    def __str__(self):
+        """Returns the representation of the composite window, for example "IntersectionWindow: (BoxWindow: [0, 1]) & (BoxWindow: [2, 3])"."""
+        return f"{type(self).__name__}: ({self.left}) {self.symbol} ({self.right})"
+
+    def __contains__(self, point):
+        """Returns True if the point belongs to the window."""
+        assert len(point) == self.dimension()
+        return bool(self.indicator_function(point))
+
+    def dimension(self):
+        """Returns the dimension of the window."""
+        return self.left.dimension()
+
+    def _combine(self, points):
+        """Returns the mask of the composite window on the array ``points``, the right operand being only evaluated on the points left undecided by the left operand."""
+        mask = self.left.indicator_function(points)
+        undecided = mask if self.evaluate_right_inside else ~mask
+        indices = np.flatnonzero(undecided)
+        right = self.right.indicator_function(points[indices])
+        mask[indices] = ~right if self.negate_right else right
+        return mask
+
+    def indicator_function(self, points):
+        """Returns True if the point belongs to the window, or the corresponding boolean mask for an array of points.
+
+        The right operand is only evaluated on the points for which the left operand does not already decide the result.
+
+        Args:
+            points (numpy.array): a single point of shape (d,) or an array of points of shape (N, d).
+
+        Returns:
+            boolean or numpy.array: True if the point belongs to the window, or the boolean mask of shape (N,) if an array of points is given.
+        """
+        points = np.asarray(points)
+        assert points.shape[-1] == self.dimension()
+        if points.ndim == 1:
+            return bool(self._combine(points[None, :])[0])
+        return self._combine(points)
+
+    def exact_volume(self):
+        """Returns the volume of the window when a closed form is available, otherwise None."""
+        return None
+
+    def volume(self, rng=None, **kwargs):
+        """Returns the volume of the window, exact when a closed form is available, otherwise estimated by Monte Carlo in the bounding box of the window.
+
+        Args:
+            rng (numpy.random._generator.Generator, optional): Random number generator of the Monte Carlo estimation. Defaults to None.
+            kwargs: options of :py:func:`~sdia_python.lab2.monte_carlo.estimate_volume`, e.g. ``rel_tol`` or ``n_max``.
+
+        Returns:
+            float: the volume of the window
+        """
+        volume = self.exact_volume()
+        if volume is not None:
+            return volume
+        bounding_box = self.bounding_box()
+        if isinstance(bounding_box, EmptyWindow):
+            return 0.0
+        kwargs.setdefault("rel_tol", 1e-3)
+        return estimate_volume(self, bounding_box, rng=rng, **kwargs)[0]
+
+    def rand(self, n=1, rng=None, max_batches=20, max_batch_size=10 ** 6):
+        """Generate n points uniformly at random inside the window by rejection sampling from its bounding box.
+
+        Points are drawn by vectorized batches whose size is adapted to the running acceptance rate.
+
+        Args:
+            n (int, optional): Number of points. Defaults to 1.
+            rng (numpy.random._generator.Generator, optional): Random number generator. Defaults to None.
+            max_batches (int, optional): number of batches without any accepted point after which the window is considered empty. Defaults to 20.
+            max_batch_size (int, optional): maximal number of points drawn at once. Defaults to 10**6.
+
+        Returns:
+            numpy.array: An array of shape (n, d) of points generated uniformly at random inside the window.
+        """
+        rng = get_random_number_generator(rng)
+        bounding_box = self.bounding_box()
+        if isinstance(bounding_box, EmptyWindow):
+            raise Exception("Cannot sample points in an empty window")
+        points = np.empty((n, self.dimension()))
+        accepted, drawn, misses = 0, 0, 0
+        acceptance = 0.5
+        while accepted < n:
+            size = min(int(1.1 * (n - accepted) / acceptance) + 1, max_batch_size)
+            candidates = bounding_box.rand(size, rng=rng)
+            candidates = candidates[self.indicator_function(candidates)]
+            candidates = candidates[: n - accepted]
+            points[accepted : accepted + len(candidates)] = candidates
+            accepted += len(candidates)
+            drawn += size
+            misses = misses + 1 if len(candidates) == 0 else 0
+            if misses == max_batches:
+                raise Exception("No point was accepted, the window seems empty")
+            acceptance = accepted / drawn if accepted else acceptance / 2
+        return points
+
+
+class IntersectionWindow(CompositeWindow):
+    """Lazy intersection ``left & right`` of two windows."""
+
+    symbol = "&"
+
+    def bounding_box(self):
+        """Returns the intersection of the bounding boxes of the operands."""
+        return self.left.bounding_box() & self.right.bounding_box()
+
+    def exact_volume(self):
+        if isinstance(self.bounding_box(), EmptyWindow):
+            return 0.0
+        return None
+
+
+class UnionWindow(CompositeWindow):
+    """Lazy union ``left | right`` of two windows."""
+
+    symbol = "|"
+    evaluate_right_inside = False
+
+    def bounding_box(self):
+        """Returns the smallest box containing the bounding boxes of the operands, ignoring an empty operand."""
+        left, right = self.left.bounding_box(), self.right.bounding_box()
+        if isinstance(left, EmptyWindow):
+            return right
+        if isinstance(right, EmptyWindow):
+            return left
+        return left.hull(right)
+
+    def exact_volume(self):
+        left, right = _exact_volume(self.left), _exact_volume(self.right)
+        overlap = _exact_volume(self.left & self.right)
+        if None in (left, right, overlap):
+            return None
+        return left + right - overlap
+
+
+class DifferenceWindow(CompositeWindow):
+    """Lazy difference ``left - right`` of two windows."""
+
+    symbol = "-"
+    negate_right = True
+
+    def bounding_box(self):
+        """Returns the bounding box of the left operand."""
+        return self.left.bounding_box()
+
+    def exact_volume(self):
+        left = _exact_volume(self.left)
+        overlap = _exact_volume(self.left & self.right)
+        if None in (left, overlap):
+            return None
+        return left - overlap
+
+
+def _exact_volume(window):
+    """Returns the volume of ``window`` when a closed form is available, otherwise None."""
+    if isinstance(window, CompositeWindow):
+        return window.exact_volume()
+    return window.volume()
@@ -0,0 +1,220 @@
+"""Opt-in instrumentation of the hot methods of the windows.
+
+When enabled, the methods listed in :py:data:`TARGETS` are replaced on their class by wrappers recording, per window class and method, the number of calls, their latencies, the number of points processed and the number of bytes of the returned arrays.
+When disabled, the original methods are restored, so that the instrumentation has no overhead at all.
+
+.. code-block:: python
+
+    from sdia_python.lab2 import instrumentation
+
+    with instrumentation.collect() as collector:
+        window.rand(1000)
+        window.indicator_function(points)
+    print(collector.to_json(indent=2))
+"""
+import contextlib
+import functools
+import json
+import math
+import time
+
+import numpy as np
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.composite import CompositeWindow
+
+METHODS = ("rand", "indicator_function", "__contains__", "volume")
+
+TARGETS = {BoxWindow: METHODS, BallWindow: METHODS, CompositeWindow: METHODS}
+
+PERCENTILES = (50, 90, 99)
+
+# latencies are counted in buckets growing by a factor 2 ** (1 / 8), i.e. a relative
+# resolution of 9%, from 1 ns to about 3 days, so that memory does not grow with calls
+MIN_LATENCY = 1e-9
+BUCKETS_PER_OCTAVE = 8
+N_BUCKETS = 48 * BUCKETS_PER_OCTAVE
+
+_collector = None
+_originals = {}
+
+
+class Collector:
+    """Statistics of the instrumented calls, keyed by ``"<class>.<method>"``."""
+
+    def __init__(self):
+        """Constructor of an empty Collector."""
+        self.stats = {}
+
+    def record(self, key, elapsed, result):
+        """Record a call of duration ``elapsed`` seconds returning ``result``.
+
+        The number of points processed is the length of the returned array, e.g. the number of points sampled by ``rand`` or tested by ``indicator_function``, and 1 for a scalar result of ``__contains__``.
+
+        Args:
+            key (str): name of the method, e.g. "BoxWindow.rand".
+            elapsed (float): duration of the call in seconds.
+            result (object): value returned by the call.
+        """
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = {
+                "calls": 0,
+                "total_time": 0.0,
+                "max_time": 0.0,
+                "buckets": [0] * N_BUCKETS,
+                "points": 0,
+                "bytes": 0,
+            }
+        stats["calls"] += 1
+        stats["total_time"] += elapsed
+        stats["max_time"] = max(stats["max_time"], elapsed)
+        stats["buckets"][_bucket(elapsed)] += 1
+        if isinstance(result, np.ndarray):
+            stats["points"] += len(result) if result.ndim else 1
+            stats["bytes"] += result.nbytes
+        elif isinstance(result, (bool, np.bool_)):
+            stats["points"] += 1
+
+    def reset(self):
+        """Forget all the recorded calls."""
+        self.stats = {}
+
+    def snapshot(self):
+        """Returns the statistics of the recorded calls.
+
+        The percentiles are estimated from the histogram of the latencies, within its relative resolution of 9%.
+
+        Returns:
+            dict: for each ``"<class>.<method>"``, the number of ``calls``, the ``total_time``, ``mean_time``, ``max_time`` and percentiles ``p50``, ``p90`` and ``p99`` of the latencies in seconds, the number of ``points`` processed and the number of ``bytes`` of the returned arrays.
+        """
+        snapshot = {}
+        for key, stats in sorted(self.stats.items()):
+            cumulative = np.cumsum(stats["buckets"])
+            percentiles = {}
+            for q in PERCENTILES:
+                k = int(np.searchsorted(cumulative, q / 100 * stats["calls"]))
+                upper = MIN_LATENCY * 2 ** ((k + 1) / BUCKETS_PER_OCTAVE)
+                percentiles[f"p{q}"] = min(upper, stats["max_time"])
+            snapshot[key] = {
+                "calls": stats["calls"],
+                "total_time": stats["total_time"],
+                "mean_time": stats["total_time"] / stats["calls"],
+                "max_time": stats["max_time"],
+                **percentiles,
+                "points": stats["points"],
+                "bytes": stats["bytes"],
+            }
+        return snapshot
+
+    def to_json(self, **kwargs):
+        """Returns the snapshot of the statistics serialized in JSON.
+
+        Args:
+            kwargs: options of :py:func:`json.dumps`, e.g. ``indent``.
+
+        Returns:
+            str: the JSON representation of :py:meth:`snapshot`.
+        """
+        return json.dumps(self.snapshot(), **kwargs)
+
+
+def _bucket(elapsed):
+    """Returns the index of the histogram bucket of the latency ``elapsed``."""
+    if elapsed <= MIN_LATENCY:
+        return 0
+    k = int(math.log2(elapsed / MIN_LATENCY) * BUCKETS_PER_OCTAVE)
+    return min(k, N_BUCKETS - 1)
+
+
+def _instrumented(method, name):
+    """Returns a wrapper of ``method`` recording its calls in the current collector."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        result = method(self, *args, **kwargs)
+        elapsed = time.perf_counter() - start
+        if _collector is not None:
+            _collector.record(f"{type(self).__name__}.{name}", elapsed, result)
+        return result
+
+    return wrapper
+
+
+def _patch():
+    """Replace the methods listed in TARGETS by their instrumented wrappers."""
+    for cls, names in TARGETS.items():
+        for name in names:
+            if (cls, name) in _originals or name not in vars(cls):
+                continue
+            method = vars(cls)[name]
+            _originals[cls, name] = method
+            setattr(cls, name, _instrumented(method, name))
+
+
+def _unpatch():
+    """Restore the original methods."""
+    for (cls, name), method in _originals.items():
+        setattr(cls, name, method)
+    _originals.clear()
+
+
+def enable(collector=None):
+    """Start recording the calls of the instrumented methods.
+
+    Args:
+        collector (Collector, optional): collector in which the calls are recorded. Defaults to None, i.e. a new Collector.
+
+    Returns:
+        Collector: the collector in which the calls are recorded.
+    """
+    global _collector
+    _collector = collector if collector is not None else Collector()
+    _patch()
+    return _collector
+
+
+def disable():
+    """Stop recording the calls and restore the original methods.
+
+    Returns:
+        Collector: the collector in which the calls were recorded, or None if the instrumentation was not enabled.
+    """
+    global _collector
+    collector, _collector = _collector, None
+    _unpatch()
+    return collector
+
+
+def is_enabled():
+    """Returns True if the calls of the instrumented methods are being recorded."""
+    return _collector is not None
+
+
+def get_collector():
+    """Returns the collector in which the calls are being recorded, or None if the instrumentation is disabled."""
+    return _collector
+
+
+@contextlib.contextmanager
+def collect(collector=None):
+    """Context manager recording the calls of the instrumented methods made inside the ``with`` block.
+
+    The instrumentation is restored to its previous state when leaving the block, so that blocks can be nested.
+
+    Args:
+        collector (Collector, optional): collector in which the calls are recorded. Defaults to None, i.e. a new Collector.
+
+    Yields:
+        Collector: the collector in which the calls are recorded.
+    """
+    previous = _collector
+    try:
+        yield enable(collector)
+    finally:
+        if previous is None:
+            disable()
+        else:
+            enable(previous)
@@ -0,0 +1,223 @@
+from statistics import NormalDist
+
+import numpy as np
+
+from sdia_python.lab2.utils import get_random_number_generator
+
+
+def estimate_volume(
+    window,
+    bounding_box,
+    n_max=10 ** 6,
+    chunk_size=10 ** 4,
+    rel_tol=None,
+    ci_width=None,
+    confidence=0.95,
+    rng=None,
+):
+    """Estimate the volume of ``window`` by Monte Carlo, using points drawn uniformly in ``bounding_box``.
+
+    Points are drawn by chunks of ``chunk_size`` in a single reused buffer and only the running number of hits is kept, so that memory does not depend on the number of samples.
+    The estimation stops as soon as the relative standard error is below ``rel_tol``, or the width of the confidence interval of level ``confidence`` is below ``ci_width``, or ``n_max`` points have been drawn.
+    No stopping criterion is checked while all or none of the points fell inside ``window``, since the standard error is then zero.
+
+    Args:
+        window (object): window with a vectorized ``indicator_function`` method, e.g. a BoxWindow or a BallWindow.
+        bounding_box (BoxWindow): box containing ``window``, in which points are sampled.
+        n_max (int, optional): maximal number of points. Defaults to 10**6.
+        chunk_size (int, optional): number of points drawn at once. Defaults to 10**4.
+        rel_tol (float, optional): target relative standard error. Defaults to None.
+        ci_width (float, optional): target width of the confidence interval. Defaults to None.
+        confidence (float, optional): level of the confidence interval. Defaults to 0.95.
+        rng (numpy.random._generator.Generator, optional): Random number generator. Defaults to None.
+
+    Returns:
+        tuple: the estimated volume, its standard error and the number of points used.
+    """
+    assert window.dimension() == bounding_box.dimension()
+    rng = get_random_number_generator(rng)
+    box_volume = bounding_box.volume()
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    buffer = np.empty((min(chunk_size, n_max), bounding_box.dimension()))
+
+    hits, n = 0, 0
+    volume, std_error = 0.0, 0.0
+    while n < n_max:
+        size = min(chunk_size, n_max - n)
+        points = bounding_box.rand(size, rng=rng, out=buffer[:size])
+        hits += np.count_nonzero(window.indicator_function(points))
+        n += size
+
+        p = hits / n
+        volume = box_volume * p
+        std_error = box_volume * np.sqrt(p * (1 - p) / n)
+        if 0 < hits < n:
+            if rel_tol is not None and std_error <= rel_tol * volume:
+                break
+            if ci_width is not None and 2 * z * std_error <= ci_width:
+                break
+    return volume, std_error, n
+
+
+def estimate_volume_rqmc(
+    window, bounding_box, n=2 ** 12, n_replicates=16, method="sobol", rng=None
+):
+    """Estimate the volume of ``window`` by randomized quasi-Monte Carlo, using quasi-random points of ``bounding_box``.
+
+    The estimation is repeated with ``n_replicates`` independent scramblings of the quasi-random points, the error bar is the standard error of the mean of the replicates.
+
+    Args:
+        window (object): window with a vectorized ``indicator_function`` method, e.g. a BoxWindow or a BallWindow.
+        bounding_box (BoxWindow): box containing ``window``, in which points are sampled.
+        n (int, optional): number of points per replicate, preferably a power of 2 for ``"sobol"``. Defaults to 2**12.
+        n_replicates (int, optional): number of independent scramblings, at least 2. Defaults to 16.
+        method (str, optional): ``"sobol"``, ``"halton"`` or ``"lhs"``, see :py:func:`~sdia_python.lab2.qmc.sample_unit_cube`. Defaults to "sobol".
+        rng (numpy.random._generator.Generator, optional): Random number generator used to scramble the points. Defaults to None.
+
+    Returns:
+        tuple: the estimated volume, its standard error and the total number of points used.
+    """
+    assert window.dimension() == bounding_box.dimension()
+    assert n_replicates >= 2
+    rng = get_random_number_generator(rng)
+    box_volume = bounding_box.volume()
+    estimates = np.empty(n_replicates)
+    for r in range(n_replicates):
+        points = bounding_box.rand(n, rng=rng, method=method)
+        estimates[r] = box_volume * np.mean(window.indicator_function(points))
+    std_error = np.std(estimates, ddof=1) / np.sqrt(n_replicates)
+    return np.mean(estimates), std_error, n * n_replicates
+
+
+def _allocate(n, allocation):
+    """Split ``n`` samples between the strata proportionally to the weights ``allocation``, the remainder going to the largest fractional parts."""
+    weights = np.asarray(allocation, dtype=float).ravel()
+    shares = n * weights / weights.sum()
+    counts = np.floor(shares).astype(np.int64)
+    remainder = n - counts.sum()
+    counts[np.argsort(counts - shares)[:remainder]] += 1
+    return counts
+
+
+def _stratum_moments(labels, y, z, n_strata):
+    """Returns the number of samples, the means of ``y`` and ``z``, the sums of squared deviations of ``y`` and ``z`` and the sum of their cross deviations in each stratum."""
+    counts = np.bincount(labels, minlength=n_strata)
+    safe = np.maximum(counts, 1)
+    mean_y = np.bincount(labels, weights=y, minlength=n_strata) / safe
+    mean_z = np.bincount(labels, weights=z, minlength=n_strata) / safe
+    dy, dz = y - mean_y[labels], z - mean_z[labels]
+    return (
+        counts,
+        mean_y,
+        mean_z,
+        np.bincount(labels, weights=dy * dy, minlength=n_strata),
+        np.bincount(labels, weights=dz * dz, minlength=n_strata),
+        np.bincount(labels, weights=dy * dz, minlength=n_strata),
+    )
+
+
+def _merge_moments(a, b):
+    """Merge the moments of two batches of samples computed by :py:func:`_stratum_moments`, with the pairwise update of Chan et al."""
+    n_a, mean_y_a, mean_z_a, m_yy_a, m_zz_a, m_yz_a = a
+    n_b, mean_y_b, mean_z_b, m_yy_b, m_zz_b, m_yz_b = b
+    n = n_a + n_b
+    factor = n_a * n_b / np.maximum(n, 1)
+    delta_y, delta_z = mean_y_b - mean_y_a, mean_z_b - mean_z_a
+    ratio = n_b / np.maximum(n, 1)
+    return (
+        n,
+        mean_y_a + delta_y * ratio,
+        mean_z_a + delta_z * ratio,
+        m_yy_a + m_yy_b + delta_y ** 2 * factor,
+        m_zz_a + m_zz_b + delta_z ** 2 * factor,
+        m_yz_a + m_yz_b + delta_y * delta_z * factor,
+    )
+
+
+def integrate(
+    f,
+    window,
+    n=10 ** 4,
+    strata=None,
+    allocation=None,
+    antithetic=False,
+    control_variate=None,
+    batch_size=10 ** 5,
+    rng=None,
+):
+    """Estimate the integral of ``f`` over ``window`` by Monte Carlo, with optional variance reduction.
+
+    The bounding box of ``window`` is split into a regular grid of ``strata`` sub-boxes, and each sub-box receives a number of points proportional to ``allocation``, e.g. to its volume times the standard deviation of ``f`` on it for the optimal Neyman allocation.
+    With ``antithetic``, each point u of a sub-box, in coordinates relative to the sub-box, is paired with its reflection 1 - u and the sample is the mean of ``f`` on the pair.
+    With ``control_variate=(g, integral)``, the estimate of the integral of ``f`` is corrected by the error on the integral of ``g``, with the coefficient minimizing the variance.
+    ``f`` and ``g`` are evaluated on batches of ``batch_size`` points and only the moments of the samples in each stratum are kept, so that memory does not depend on ``n``.
+    For a window which is not a box, ``f`` is integrated over its bounding box times its indicator function.
+
+    Args:
+        f (callable): vectorized function mapping an array of points of shape (N, d) to an array of shape (N,).
+        window (object): window with ``bounding_box`` and ``indicator_function`` methods, e.g. a BoxWindow or a BallWindow.
+        n (int, optional): number of evaluations of ``f``. Defaults to 10**4.
+        strata (int or tuple, optional): number of sub-boxes along each axis, or along all the axes. Defaults to None, i.e. a single stratum.
+        allocation (numpy.array, optional): nonnegative weights of the strata, of shape ``strata``. Defaults to None, i.e. the same number of points in each stratum.
+        antithetic (bool, optional): use antithetic pairs of points. Defaults to False.
+        control_variate (tuple, optional): vectorized function g and its known integral over ``window``. Defaults to None.
+        batch_size (int, optional): number of points evaluated at once. Defaults to 10**5.
+        rng (numpy.random._generator.Generator, optional): Random number generator. Defaults to None.
+
+    Returns:
+        tuple: the estimated integral and the estimated variance of the estimator.
+    """
+    rng = get_random_number_generator(rng)
+    box = window.bounding_box()
+    d = box.dimension()
+    strata = np.broadcast_to(1 if strata is None else strata, d).astype(np.int64)
+    n_strata = int(np.prod(strata))
+    cell_widths = box.widths() / strata
+    cell_volume = box.volume() / n_strata
+
+    # the samples are the points, or the antithetic pairs of points
+    n_samples = n // 2 if antithetic else n
+    if allocation is None:
+        allocation = np.ones(n_strata)
+    counts = _allocate(n_samples, allocation)
+    if np.any(counts < 2):
+        raise Exception("n is too small to draw at least 2 samples in each stratum")
+    # the samples are ordered by stratum, the k-th stratum ending at ends[k]
+    ends = np.cumsum(counts)
+
+    def evaluate(points):
+        y = f(points)
+        z = np.zeros(len(points))
+        if control_variate is not None:
+            z = control_variate[0](points)
+        if window is not box:
+            inside = window.indicator_function(points)
+            y, z = y * inside, z * inside
+        return y, z
+
+    moments = None
+    for start in range(0, n_samples, batch_size):
+        stop = min(start + batch_size, n_samples)
+        batch_labels = np.searchsorted(ends, np.arange(start, stop), side="right")
+        cells = np.column_stack(np.unravel_index(batch_labels, strata))
+        u = rng.random((len(batch_labels), d))
+        lower = box.bounds[:, 0] + cells * cell_widths
+        y, z = evaluate(lower + u * cell_widths)
+        if antithetic:
+            y_reflected, z_reflected = evaluate(lower + (1 - u) * cell_widths)
+            y, z = (y + y_reflected) / 2, (z + z_reflected) / 2
+        batch = _stratum_moments(batch_labels, y, z, n_strata)
+        moments = batch if moments is None else _merge_moments(moments, batch)
+
+    counts, mean_y, mean_z, m_yy, m_zz, m_yz = moments
+    # variance of the stratum means, cell_volume ** 2 * sample variance / count
+    weights = cell_volume ** 2 / (counts * (counts - 1))
+    estimate = cell_volume * np.sum(mean_y)
+    variance = np.sum(weights * m_yy)
+    if control_variate is not None:
+        variance_g, covariance = np.sum(weights * m_zz), np.sum(weights * m_yz)
+        if variance_g > 0:
+            beta = covariance / variance_g
+            estimate -= beta * (cell_volume * np.sum(mean_z) - control_variate[1])
+            variance -= beta * covariance
+    return estimate, max(variance, 0.0)
@@ -0,0 +1,59 @@
+"""Compiled kernels of the ``"numba"`` backend, see :py:mod:`sdia_python.lab2.backend`.
+
+Each kernel is a fused loop writing directly in its output, without temporary arrays.
+The kernels are compiled on first call and cached on disk.
+"""
+
+import numba
+
+
+@numba.njit(cache=True)
+def box_indicator_function(points, lower, upper, out):
+    """Store in ``out[i]`` whether ``lower <= points[i] <= upper`` coordinatewise."""
+    n, d = points.shape
+    for i in range(n):
+        inside = True
+        for j in range(d):
+            x = points[i, j]
+            if not (lower[j] <= x and x <= upper[j]):
+                inside = False
+                break
+        out[i] = inside
+    return out
+
+
+@numba.njit(cache=True)
+def ball_indicator_function(points, center, radius_squared, out):
+    """Store in ``out[i]`` whether the squared distance from ``points[i]`` to ``center`` is at most ``radius_squared``."""
+    n, d = points.shape
+    for i in range(n):
+        s = 0.0
+        for j in range(d):
+            diff = points[i, j] - center[j]
+            s += diff * diff
+        out[i] = s <= radius_squared
+    return out
+
+
+@numba.njit(cache=True)
+def box_scale(out, lower, widths):
+    """Map in place uniform draws of the unit cube ``out`` to the box ``lower + widths * out``."""
+    n, d = out.shape
+    for i in range(n):
+        for j in range(d):
+            out[i, j] = out[i, j] * widths[j] + lower[j]
+    return out
+
+
+@numba.njit(cache=True)
+def ball_scale(out, u, center, radius):
+    """Map in place standard Gaussian draws ``out`` and uniform draws ``u`` to uniform points of the ball."""
+    n, d = out.shape
+    for i in range(n):
+        s = 0.0
+        for j in range(d):
+            s += out[i, j] * out[i, j]
+        scale = radius * u[i] ** (1 / d) / s ** 0.5
+        for j in range(d):
+            out[i, j] = out[i, j] * scale + center[j]
+    return out
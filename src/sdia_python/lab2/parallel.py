@@ -0,0 +1,148 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from sdia_python.lab2.utils import get_random_number_generator, spawn_seed_sequences
+
+
+def _shard_sizes(n, n_workers):
+    """Split ``n`` into ``n_workers`` sizes differing by at most one."""
+    q, r = divmod(n, n_workers)
+    return [q + (k < r) for k in range(n_workers)]
+
+
+class _SharedArray:
+    """Owner of a shared memory block exposed as an array through ``__array_interface__``.
+
+    The arrays built on it keep it alive, and the block is released when the last of them is deleted.
+    """
+
+    def __init__(self, shared_memory, shape, dtype=np.float64):
+        self.shared_memory = shared_memory
+        # the temporary array only gives the address, it does not keep an export of
+        # the buffer
+        address = np.frombuffer(shared_memory.buf, dtype=np.uint8).ctypes.data
+        self.__array_interface__ = {
+            "shape": shape,
+            "typestr": np.dtype(dtype).str,
+            "data": (address, False),
+            "version": 3,
+        }
+
+    def __del__(self):
+        self.shared_memory.close()
+
+
+def _rand_shard(window, n, seed, name, shape, start):
+    """Draw the ``n`` points of one shard into the rows ``start:start + n`` of the shared array ``name``, run in a worker process."""
+    shared_memory = SharedMemory(name=name)
+    try:
+        points = np.ndarray(shape, buffer=shared_memory.buf)
+        points[start : start + n] = window.rand(
+            n, rng=get_random_number_generator(seed)
+        )
+        del points
+    finally:
+        shared_memory.close()
+
+
+def _count_hits_shard(window, bounding_box, n, chunk_size, seed):
+    """Count the points of ``bounding_box`` falling in ``window``, run in a worker process."""
+    rng = get_random_number_generator(seed)
+    buffer = np.empty((min(chunk_size, n), bounding_box.dimension()))
+    hits = 0
+    for start in range(0, n, chunk_size):
+        size = min(chunk_size, n - start)
+        points = bounding_box.rand(size, rng=rng, out=buffer[:size])
+        hits += np.count_nonzero(window.indicator_function(points))
+    return hits
+
+
+def _map_shards(function, shards, n_workers, executor=None):
+    """Apply ``function`` to each tuple of arguments of ``shards`` in ``executor``, or in a new pool of ``n_workers`` processes, and return the results in order."""
+    if executor is not None:
+        return list(executor.map(function, *zip(*shards)))
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(function, *zip(*shards)))
+
+
+def parallel_rand(window, n=1, seed=None, n_workers=None, executor=None):
+    """Generate n points uniformly at random inside ``window`` using a pool of processes.
+
+    The points are split into ``n_workers`` shards, each shard being drawn by a worker with its own random stream spawned from ``seed`` with :py:func:`spawn_seed_sequences`.
+    The workers write their shard directly into a shared memory block which backs the returned array, so that no point is sent back through a pipe nor copied by the calling process.
+    For a given ``seed`` and ``n_workers``, the output is identical from one run to another.
+
+    Args:
+        window (object): window with a ``rand`` method, e.g. a BoxWindow or a BallWindow.
+        n (int, optional): Number of points. Defaults to 1.
+        seed (int, optional): root seed of the random streams. Defaults to None.
+        n_workers (int, optional): number of shards, and of worker processes of the new pool. Defaults to os.cpu_count().
+        executor (concurrent.futures.ProcessPoolExecutor, optional): pool reused from one call to another instead of starting a new one. Defaults to None.
+
+    Returns:
+        numpy.array: An array of shape (n, d) of points generated uniformly at random inside ``window``.
+    """
+    n_workers = n_workers or os.cpu_count()
+    sizes = _shard_sizes(n, n_workers)
+    seeds = spawn_seed_sequences(seed, n_workers)
+    shape = (n, window.dimension())
+    nbytes = max(int(np.prod(shape)) * np.dtype(np.float64).itemsize, 1)
+    shared_memory = SharedMemory(create=True, size=nbytes)
+    try:
+        starts = np.cumsum([0] + sizes[:-1])
+        shards = [
+            (window, size, s, shared_memory.name, shape, start)
+            for size, s, start in zip(sizes, seeds, starts)
+        ]
+        _map_shards(_rand_shard, shards, n_workers, executor)
+        points = np.asarray(_SharedArray(shared_memory, shape))
+    except BaseException:
+        shared_memory.close()
+        raise
+    finally:
+        # the memory stays mapped until the array is deleted
+        shared_memory.unlink()
+    return points
+
+
+def parallel_estimate_volume(
+    window,
+    bounding_box,
+    n=10 ** 6,
+    chunk_size=10 ** 4,
+    seed=None,
+    n_workers=None,
+    executor=None,
+):
+    """Estimate the volume of ``window`` by Monte Carlo, using ``n`` points drawn uniformly in ``bounding_box`` by a pool of processes.
+
+    Each worker counts the hits of its own shard of points, drawn by chunks from a random stream spawned from ``seed``, and the counts are summed.
+    For a given ``seed`` and ``n_workers``, the output is identical from one run to another.
+
+    Args:
+        window (object): window with a vectorized ``indicator_function`` method, e.g. a BoxWindow or a BallWindow.
+        bounding_box (BoxWindow): box containing ``window``, in which points are sampled.
+        n (int, optional): number of points. Defaults to 10**6.
+        chunk_size (int, optional): number of points drawn at once by a worker. Defaults to 10**4.
+        seed (int, optional): root seed of the random streams. Defaults to None.
+        n_workers (int, optional): number of shards, and of worker processes of the new pool. Defaults to os.cpu_count().
+        executor (concurrent.futures.ProcessPoolExecutor, optional): pool reused from one call to another instead of starting a new one. Defaults to None.
+
+    Returns:
+        tuple: the estimated volume, its standard error and the number of points used.
+    """
+    assert window.dimension() == bounding_box.dimension()
+    n_workers = n_workers or os.cpu_count()
+    sizes = _shard_sizes(n, n_workers)
+    seeds = spawn_seed_sequences(seed, n_workers)
+    shards = [
+        (window, bounding_box, size, chunk_size, s) for size, s in zip(sizes, seeds)
+    ]
+
+    hits = sum(_map_shards(_count_hits_shard, shards, n_workers, executor))
+    p = hits / n
+    box_volume = bounding_box.volume()
+    return box_volume * p, box_volume * np.sqrt(p * (1 - p) / n), n
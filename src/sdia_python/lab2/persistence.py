@@ -0,0 +1,173 @@
+import json
+
+import numpy as np
+
+from sdia_python.lab2.ball_window import BallWindow, UnitBallWindow
+from sdia_python.lab2.box_window import BoxWindow, UnitBoxWindow
+from sdia_python.lab2.point_process import PointPatterns, _offsets
+
+MAGIC = b"SDIAWIN1"
+ALIGNMENT = 64
+
+# the index of the class of a window is stored in the file
+WINDOW_CLASSES = (BoxWindow, UnitBoxWindow, BallWindow, UnitBallWindow)
+
+
+def _aligned(size):
+    """Returns the smallest multiple of ALIGNMENT greater than or equal to ``size``."""
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def _window_arrays(windows):
+    """Returns the columnar arrays describing ``windows``.
+
+    The bounds of the boxes are stacked in a single (sum of the dimensions, 2) array, the centers of the balls in a single flat array, the k-th window being the ``indices[k]``-th box or ball.
+    """
+    classes = np.empty(len(windows), dtype=np.uint8)
+    indices = np.empty(len(windows), dtype=np.int64)
+    boxes, balls = [], []
+    for k, window in enumerate(windows):
+        if type(window) not in WINDOW_CLASSES:
+            raise Exception(f"Cannot save a window of type {type(window).__name__}")
+        classes[k] = WINDOW_CLASSES.index(type(window))
+        family = boxes if isinstance(window, BoxWindow) else balls
+        indices[k] = len(family)
+        family.append(window)
+
+    return {
+        "classes": classes,
+        "indices": indices,
+        "box_offsets": _offsets([w.dimension() for w in boxes]),
+        "box_bounds": np.concatenate(
+            [w.bounds for w in boxes] or [np.empty((0, 2))]
+        ).astype(float),
+        "ball_offsets": _offsets([w.dimension() for w in balls]),
+        "ball_centers": np.concatenate(
+            [w.center for w in balls] or [np.empty(0)]
+        ).astype(float),
+        "ball_radii": np.array([w.radius for w in balls], dtype=float),
+    }
+
+
+def save(filename, windows=(), samples=None):
+    """Save windows and sample sets in a single binary file, which can be memory-mapped by :py:class:`WindowStore`.
+
+    The file starts with a JSON header giving the dtype, shape and position of each array, followed by the raw arrays aligned on 64 bytes: the windows are stored columnar, see :py:func:`_window_arrays`, and the samples as their flat points and offsets.
+
+    Args:
+        filename (str): path of the file.
+        windows (list, optional): list of BoxWindow, UnitBoxWindow, BallWindow or UnitBallWindow. Defaults to ().
+        samples (PointPatterns or numpy.array, optional): sample sets, or a single sample set of shape (N, d). Defaults to None.
+    """
+    arrays = _window_arrays(windows)
+    if samples is not None:
+        if isinstance(samples, np.ndarray):
+            samples = PointPatterns(samples, np.array([0, len(samples)]))
+        arrays["points"] = np.ascontiguousarray(samples.points)
+        arrays["sample_offsets"] = np.asarray(samples.offsets, dtype=np.int64)
+
+    header, size = {}, 0
+    for name, array in arrays.items():
+        header[name] = {"dtype": array.dtype.str, "shape": array.shape, "offset": size}
+        size += _aligned(array.nbytes)
+    encoded = json.dumps(header).encode()
+    start = _aligned(len(MAGIC) + 8 + len(encoded))
+
+    with open(filename, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(encoded).to_bytes(8, "little"))
+        f.write(encoded)
+        for name, array in arrays.items():
+            f.seek(start + header[name]["offset"])
+            array.tofile(f)
+        f.truncate(start + size)
+
+
+def load(filename):
+    """Load the windows and the sample sets saved by :py:func:`save`.
+
+    The sample points are memory-mapped, not copied, see :py:class:`WindowStore`.
+
+    Args:
+        filename (str): path of the file.
+
+    Returns:
+        tuple: the list of windows and the sample sets as a PointPatterns, or None if no samples were saved.
+    """
+    store = WindowStore(filename)
+    return list(store), store.samples
+
+
+class WindowStore:
+    """Read-only access to a file written by :py:func:`save`.
+
+    The file is memory-mapped once and its arrays are views of the mapping, so that nothing is read until it is accessed.
+    The windows are only built when they are indexed.
+    """
+
+    def __init__(self, filename):
+        """Constructor of a WindowStore.
+
+        Args:
+            filename (str): path of a file written by :py:func:`save`.
+        """
+        buffer = np.memmap(filename, dtype=np.uint8, mode="r")
+        if bytes(buffer[: len(MAGIC)]) != MAGIC:
+            raise Exception(f"{filename} is not a window file")
+        size = int.from_bytes(bytes(buffer[len(MAGIC) : len(MAGIC) + 8]), "little")
+        end = len(MAGIC) + 8 + size
+        header = json.loads(bytes(buffer[len(MAGIC) + 8 : end]))
+        start = _aligned(end)
+
+        self.arrays = {}
+        for name, info in header.items():
+            dtype, shape = np.dtype(info["dtype"]), tuple(info["shape"])
+            count = int(np.prod(shape))
+            array = np.frombuffer(
+                buffer, dtype=dtype, count=count, offset=start + info["offset"]
+            )
+            self.arrays[name] = array.reshape(shape)
+
+        self.samples = None
+        if "points" in self.arrays:
+            self.samples = PointPatterns(
+                self.arrays["points"], self.arrays["sample_offsets"]
+            )
+
+    def __len__(self):
+        """Returns the number of windows.
+
+        Returns:
+            int: the number of windows
+        """
+        return len(self.arrays["classes"])
+
+    def __getitem__(self, k):
+        """Build the k-th window, or the list of windows of a slice.
+
+        Args:
+            k (int or slice): index of the window.
+
+        Returns:
+            object: the k-th window, of the class it was saved with.
+        """
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(len(self)))]
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("window index out of range")
+
+        cls = WINDOW_CLASSES[self.arrays["classes"][k]]
+        i = self.arrays["indices"][k]
+        # bypass the constructors of the unit windows, which take a center
+        window = cls.__new__(cls)
+        if issubclass(cls, BoxWindow):
+            offsets = self.arrays["box_offsets"]
+            bounds = self.arrays["box_bounds"][offsets[i] : offsets[i + 1]]
+            BoxWindow.__init__(window, bounds)
+        else:
+            offsets = self.arrays["ball_offsets"]
+            center = self.arrays["ball_centers"][offsets[i] : offsets[i + 1]]
+            BallWindow.__init__(window, center, float(self.arrays["ball_radii"][i]))
+        return window
@@ -0,0 +1,125 @@
+import numpy as np
+
+from sdia_python.lab2.utils import get_random_number_generator
+
+
+class PointPatterns:
+    """Ragged collection of point patterns, stored as a single (N, d) array of points and an array of offsets.
+
+    The points of the k-th pattern are ``points[offsets[k] : offsets[k + 1]]``.
+    """
+
+    def __init__(self, points, offsets):
+        """Constructor of a PointPatterns
+
+        Args:
+            points (numpy.array): the points of all the patterns, of dimension N * d.
+            offsets (numpy.array): the K + 1 increasing offsets of the patterns, starting at 0 and ending at N.
+        """
+        assert isinstance(points, np.ndarray)
+        offsets = np.asarray(offsets)
+        if offsets[0] != 0 or offsets[-1] != len(points):
+            raise Exception("The offsets do not match the points")
+        if np.any(np.diff(offsets) < 0):
+            raise Exception("The offsets are not in the right order")
+        self.points = points
+        self.offsets = offsets
+
+    def __len__(self):
+        """Returns the number of patterns.
+
+        Returns:
+            int: the number of patterns
+        """
+        return len(self.offsets) - 1
+
+    def __getitem__(self, k):
+        """Returns the points of the k-th pattern, without copy.
+
+        Args:
+            k (int): index of the pattern.
+
+        Returns:
+            numpy.array: array of shape (n_k, d) of the points of the pattern.
+        """
+        if k < 0:
+            k += len(self)
+        return self.points[self.offsets[k] : self.offsets[k + 1]]
+
+    def counts(self):
+        """Returns the number of points of each pattern.
+
+        Returns:
+            numpy.array: array of shape (K,) of the numbers of points.
+        """
+        return np.diff(self.offsets)
+
+    def labels(self):
+        """Returns the index of the pattern of each point.
+
+        Returns:
+            numpy.array: array of shape (N,) of the indices of the patterns.
+        """
+        return np.repeat(np.arange(len(self)), self.counts())
+
+
+def _offsets(counts):
+    """Returns the offsets of patterns having ``counts`` points."""
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _patterns_from_counts(window, counts, rng):
+    """Draw ``counts[k]`` points uniformly in ``window`` for each k, in a single call to ``window.rand``."""
+    offsets = _offsets(counts)
+    return PointPatterns(window.rand(int(offsets[-1]), rng=rng), offsets)
+
+
+def binomial_process(window, n_points, n_realizations=1, rng=None):
+    """Simulate realizations of the binomial point process with ``n_points`` points in ``window``.
+
+    Args:
+        window (object): window with a ``rand`` method, e.g. a BoxWindow or a BallWindow.
+        n_points (int): number of points of each realization.
+        n_realizations (int, optional): number of realizations. Defaults to 1.
+        rng (numpy.random._generator.Generator, optional): Random number generator. Defaults to None.
+
+    Returns:
+        PointPatterns: the realizations.
+    """
+    rng = get_random_number_generator(rng)
+    counts = np.full(n_realizations, n_points, dtype=np.int64)
+    return _patterns_from_counts(window, counts, rng)
+
+
+def poisson_process(window, intensity, n_realizations=1, rng=None, max_intensity=None):
+    """Simulate realizations of a Poisson point process of intensity ``intensity`` in ``window``.
+
+    The numbers of points of all the realizations are drawn at once, and all the points are drawn in a single flat array.
+    An inhomogeneous intensity function is handled by thinning a homogeneous process of intensity ``max_intensity``: each point x is kept with probability ``intensity(x) / max_intensity``, all the points being tested at once.
+
+    Args:
+        window (object): window with ``rand`` and ``volume`` methods, e.g. a BoxWindow or a BallWindow.
+        intensity (float or callable): constant intensity, or vectorized function mapping an array of points of shape (N, d) to their intensities of shape (N,).
+        n_realizations (int, optional): number of realizations. Defaults to 1.
+        rng (numpy.random._generator.Generator, optional): Random number generator. Defaults to None.
+        max_intensity (float, optional): upper bound of ``intensity`` on ``window``, required when ``intensity`` is a function. Defaults to None.
+
+    Returns:
+        PointPatterns: the realizations.
+    """
+    rng = get_random_number_generator(rng)
+    if not callable(intensity):
+        counts = rng.poisson(intensity * window.volume(), size=n_realizations)
+        return _patterns_from_counts(window, counts, rng)
+
+    if max_intensity is None:
+        raise Exception("max_intensity must be given for an intensity function")
+    dominating = poisson_process(window, max_intensity, n_realizations, rng)
+    values = intensity(dominating.points)
+    if np.any(values > max_intensity):
+        raise Exception("The intensity exceeds max_intensity")
+    keep = rng.random(len(values)) * max_intensity < values
+    counts = np.bincount(dominating.labels()[keep], minlength=n_realizations)
+    return PointPatterns(dominating.points[keep], _offsets(counts))
@@ -0,0 +1,166 @@
+import queue
+import threading
+import time
+
+import numpy as np
+
+from sdia_python.lab2.utils import get_random_number_generator, spawn_seed_sequences
+
+
+class PrefetchSampler:
+    """Sampler of a window whose points are drawn in advance by background threads.
+
+    Each worker thread draws chunks of ``chunk_size`` points with ``window.rand`` and its own random stream, spawned from ``seed`` with :py:func:`~sdia_python.lab2.utils.spawn_seed_sequences`, and puts them in a queue of at most ``max_chunks`` chunks.
+    NumPy releases the GIL while drawing, so that the chunks are generated while the caller is busy with the previous points.
+    With a single worker, the points are the same as the ones drawn by chunks with the stream of the worker; with several workers, the order in which the chunks of the workers are consumed is not reproducible.
+
+    The sampler must be closed with :py:meth:`close`, or used as a context manager.
+    """
+
+    def __init__(
+        self, window, chunk_size=10 ** 5, n_workers=2, max_chunks=8, seed=None
+    ):
+        """Constructor of a PrefetchSampler, which starts the worker threads.
+
+        Args:
+            window (object): window with a ``rand`` method, e.g. a BoxWindow or a BallWindow.
+            chunk_size (int, optional): number of points drawn at once by a worker. Defaults to 10**5.
+            n_workers (int, optional): number of worker threads. Defaults to 2.
+            max_chunks (int, optional): maximal number of chunks waiting in the queue. Defaults to 8.
+            seed (int, optional): root seed of the random streams of the workers. Defaults to None.
+        """
+        self.window = window
+        self.chunk_size = chunk_size
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._stop = threading.Event()
+        self._chunk = np.empty((0, window.dimension()))
+        self._position = 0
+        self._stats = {"requests": 0, "points": 0, "chunks": 0, "starvations": 0}
+        self._wait_time = 0.0
+        self._error = None
+        self._threads = [
+            threading.Thread(
+                target=self._fill, args=(get_random_number_generator(s),), daemon=True
+            )
+            for s in spawn_seed_sequences(seed, n_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _fill(self, rng):
+        """Draw chunks and put them in the queue until the sampler is closed, run in a worker thread.
+
+        An exception raised while drawing is put in the queue, to be raised by :py:meth:`rand`, and stops the worker.
+        """
+        while not self._stop.is_set():
+            try:
+                chunk = self.window.rand(self.chunk_size, rng=rng)
+            except Exception as error:
+                chunk = error
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(chunk, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if isinstance(chunk, Exception):
+                return
+
+    def _wait_chunk(self):
+        """Wait for the next chunk of the queue, as long as a worker is alive to produce it."""
+        while True:
+            try:
+                return self._queue.get(timeout=0.1)
+            except queue.Empty:
+                if not any(thread.is_alive() for thread in self._threads):
+                    break
+        # a worker may have put a last chunk before stopping
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            raise Exception("All the workers of the sampler have stopped")
+
+    def _next_chunk(self):
+        """Returns the next chunk of the queue, waiting for it if the queue is empty.
+
+        The first exception raised by a worker is kept and raised again by all the next calls.
+        """
+        if self._error is not None:
+            raise self._error
+        try:
+            chunk = self._queue.get_nowait()
+        except queue.Empty:
+            self._stats["starvations"] += 1
+            start = time.perf_counter()
+            chunk = self._wait_chunk()
+            self._wait_time += time.perf_counter() - start
+        if isinstance(chunk, Exception):
+            self._error = chunk
+            raise chunk
+        self._stats["chunks"] += 1
+        return chunk
+
+    def rand(self, n=1):
+        """Returns n points uniformly at random inside the window, taken from the prefetched chunks.
+
+        The call only waits for the workers when the queue is empty, which is counted as a starvation in :py:meth:`statistics`.
+
+        Args:
+            n (int, optional): Number of points. Defaults to 1.
+
+        Returns:
+            numpy.array: An array of shape (n, d) of points generated uniformly at random inside the window, possibly a read-only view of a prefetched chunk.
+        """
+        if self._stop.is_set():
+            raise Exception("The sampler is closed")
+        self._stats["requests"] += 1
+        self._stats["points"] += n
+        if self._position + n <= len(self._chunk):
+            points = self._chunk[self._position : self._position + n]
+            self._position += n
+            return points
+
+        points = np.empty((n, self.window.dimension()))
+        filled = 0
+        while filled < n:
+            if self._position == len(self._chunk):
+                self._chunk, self._position = self._next_chunk(), 0
+                self._chunk.flags.writeable = False
+            size = min(n - filled, len(self._chunk) - self._position)
+            points[filled : filled + size] = self._chunk[
+                self._position : self._position + size
+            ]
+            filled += size
+            self._position += size
+        return points
+
+    def statistics(self):
+        """Returns the statistics of the sampler.
+
+        Returns:
+            dict: the number of ``requests`` and of ``points`` handed out, the number of ``chunks`` consumed, the number of ``starvations``, i.e. of times the queue was found empty, the total ``wait_time`` in seconds spent waiting for the workers, and the current ``queue_size``.
+        """
+        return {
+            **self._stats,
+            "wait_time": self._wait_time,
+            "queue_size": self._queue.qsize(),
+        }
+
+    def close(self):
+        """Stop the worker threads and wait for them, the prefetched points are discarded."""
+        self._stop.set()
+        for thread in self._threads:
+            while thread.is_alive():
+                # free a slot for a worker blocked on a full queue
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+                thread.join(timeout=0.1)
+        self._threads = []
@@ -0,0 +1,59 @@
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+from sdia_python.lab2.utils import get_random_number_generator
+
+ENGINES = {
+    "sobol": qmc.Sobol,
+    "halton": qmc.Halton,
+    "lhs": qmc.LatinHypercube,
+}
+
+METHODS = ("random",) + tuple(ENGINES)
+
+
+def sample_unit_cube(n, d, method="random", rng=None, scramble=True):
+    """Generate n points in the unit cube [0, 1]^d, pseudo-random or quasi-random.
+
+    Quasi-random points are generated by the engines of ``scipy.stats.qmc``, randomized by ``rng`` when ``scramble`` is True. Sobol points are best balanced when n is a power of 2.
+
+    Args:
+        n (int): the number of points.
+        d (int): the dimension.
+        method (str, optional): ``"random"``, ``"sobol"``, ``"halton"`` or ``"lhs"`` (Latin hypercube). Defaults to "random".
+        rng (numpy.random._generator.Generator, optional): Random number generator. Defaults to None.
+        scramble (bool, optional): randomize the quasi-random points. Defaults to True.
+
+    Returns:
+        numpy.array: An array of shape (n, d) of points in the unit cube.
+    """
+    rng = get_random_number_generator(rng)
+    if method == "random":
+        return rng.random((n, d))
+    if method not in ENGINES:
+        raise Exception(f"method must be one of {METHODS}")
+    return ENGINES[method](d, scramble=scramble, seed=rng).random(n)
+
+
+def unit_cube_to_ball(u):
+    """Map points of the unit cube [0, 1]^(d+1) to points of the unit ball of dimension d, preserving the uniform measure.
+
+    The first d coordinates are mapped to a standard Gaussian vector by the inverse normal distribution function, which gives a uniform direction once normalized, and the last coordinate U gives the distance to the center U^(1/d).
+
+    Args:
+        u (numpy.array): array of points of shape (n, d + 1) in the unit cube.
+
+    Returns:
+        numpy.array: An array of shape (n, d) of points in the unit ball.
+    """
+    d = u.shape[1] - 1
+    eps = np.finfo(u.dtype).eps
+    points = ndtri(np.clip(u[:, :d], eps, 1 - eps))
+    norms = np.linalg.norm(points, axis=1, keepdims=True)
+    # the center of the cube has no direction, any one can be taken
+    at_center = norms[:, 0] == 0
+    points[at_center, 0], norms[at_center] = 1, 1
+    points /= norms
+    points *= u[:, d:] ** (1 / d)
+    return points
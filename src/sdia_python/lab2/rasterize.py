@@ -0,0 +1,116 @@
+import numpy as np
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.composite import EmptyWindow
+
+
+def grid_nodes(bounds, shape):
+    """Returns the coordinates of the centers of the voxels of a regular grid along each axis.
+
+    Args:
+        bounds (numpy.array): bounds of the grid, of shape (d, 2).
+        shape (tuple): number of voxels along each axis.
+
+    Returns:
+        list: for each axis k, the array of shape (shape[k],) of the coordinates of the centers of the voxels.
+    """
+    bounds = np.asarray(bounds, dtype=float)
+    steps = (bounds[:, 1] - bounds[:, 0]) / np.asarray(shape)
+    return [
+        lower + (np.arange(size) + 0.5) * step
+        for lower, size, step in zip(bounds[:, 0], shape, steps)
+    ]
+
+
+def _index_ranges(window, nodes):
+    """Returns the range of indices of the voxels whose center lies in the bounding box of ``window`` along each axis, as an array of shape (d, 2)."""
+    box = window.bounding_box()
+    return np.array(
+        [
+            [np.searchsorted(x, a, side="left"), np.searchsorted(x, b, side="right")]
+            for x, (a, b) in zip(nodes, box.bounds)
+        ]
+    )
+
+
+def _mask(window, axes):
+    """Returns the indicator of ``window`` at the centers of the voxels of the sub-grid of coordinates ``axes``, or True for a box whose bounding box is the box itself."""
+    if isinstance(window, BoxWindow):
+        return True
+    d = len(axes)
+    if isinstance(window, BallWindow):
+        # squared distances to the center, summed axis by axis by broadcasting
+        squared_distances = 0
+        for k, (x, c) in enumerate(zip(axes, window.center)):
+            shape = [1] * d
+            shape[k] = -1
+            squared_distances = squared_distances + ((x - c) ** 2).reshape(shape)
+        return squared_distances <= window.radius_squared
+    points = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, d)
+    return window.indicator_function(points).reshape([len(x) for x in axes])
+
+
+def rasterize(
+    windows, bounds, shape, counts=False, dtype=None, filename=None, slab_size=None
+):
+    """Rasterize a collection of windows on a regular grid of voxels.
+
+    A voxel is set when its center belongs to one of the windows, or counts the windows containing its center with ``counts=True``.
+    Each window is only evaluated on the block of voxels covered by its bounding box, boxes being filled without any evaluation and balls with squared distances computed separably along each axis.
+    The grid is processed by slabs of ``slab_size`` voxels along the first axis, so that the temporary arrays are bounded by the size of a slab.
+
+    Args:
+        windows (list): windows with a ``bounding_box`` method, e.g. BoxWindow, BallWindow or their combinations.
+        bounds (numpy.array): bounds of the grid, of shape (d, 2).
+        shape (tuple): number of voxels along each axis.
+        counts (bool, optional): count the windows containing each voxel instead of computing the occupancy. Defaults to False.
+        dtype (numpy.dtype, optional): type of the output. Defaults to None, i.e. bool, or with ``counts=True`` numpy.uint16, or a wider unsigned integer type if there are more windows. With ``counts=True``, a non-numeric type, e.g. bool, or an integer type too small to count all the windows raises an Exception.
+        filename (str or pathlib.Path, optional): path of a ``.npy`` file to which the output is memory-mapped. Defaults to None, i.e. an array in memory.
+        slab_size (int, optional): number of voxels of a slab along the first axis. Defaults to None, i.e. slabs of about 2**24 voxels.
+
+    Returns:
+        numpy.array: the output of shape ``shape``, a numpy.memmap if ``filename`` is given.
+    """
+    shape = tuple(shape)
+    # the empty windows, e.g. intersections of disjoint balls, have no bounds
+    windows = [w for w in windows if not isinstance(w.bounding_box(), EmptyWindow)]
+    if dtype is None:
+        dtype = bool
+        if counts:
+            dtype = np.promote_types(np.uint16, np.min_scalar_type(len(windows)))
+    elif counts:
+        # a boolean output would only record the occupancy
+        if not np.issubdtype(dtype, np.number):
+            raise Exception(f"{np.dtype(dtype)} cannot count windows")
+        if np.issubdtype(dtype, np.integer) and len(windows) > np.iinfo(dtype).max:
+            raise Exception(f"{dtype} cannot count up to {len(windows)} windows")
+    if filename is None:
+        out = np.zeros(shape, dtype=dtype)
+    else:
+        out = np.lib.format.open_memmap(filename, mode="w+", dtype=dtype, shape=shape)
+    if slab_size is None:
+        slab_size = max(1, 2 ** 24 // int(np.prod(shape[1:])))
+
+    nodes = grid_nodes(bounds, shape)
+    ranges = np.array([_index_ranges(w, nodes) for w in windows]).reshape(
+        len(windows), len(shape), 2
+    )
+    nonempty = np.all(ranges[:, :, 0] < ranges[:, :, 1], axis=1)
+
+    for start in range(0, shape[0], slab_size):
+        stop = min(start + slab_size, shape[0])
+        touching = nonempty & (ranges[:, 0, 0] < stop) & (ranges[:, 0, 1] > start)
+        for k in np.flatnonzero(touching):
+            lower, upper = ranges[k, :, 0].copy(), ranges[k, :, 1].copy()
+            lower[0], upper[0] = max(lower[0], start), min(upper[0], stop)
+            axes = [x[a:b] for x, a, b in zip(nodes, lower, upper)]
+            mask = _mask(windows[k], axes)
+            block = out[tuple(slice(a, b) for a, b in zip(lower, upper))]
+            if counts:
+                block += mask
+            else:
+                block |= mask
+        if filename is not None:
+            out.flush()
+    return out
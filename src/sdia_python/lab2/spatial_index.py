@@ -0,0 +1,153 @@
+import itertools
+
+import numpy as np
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+
+
+def _bounding_box(window):
+    """Returns the lower and upper corners of a box containing ``window``.
+
+    The box of a ball is slightly inflated so that no point accepted by ``BallWindow.__contains__`` is lost to rounding errors.
+    """
+    if isinstance(window, BoxWindow):
+        return window.bounds[:, 0], window.bounds[:, 1]
+    if isinstance(window, BallWindow):
+        radius = window.radius * (1 + 1e-9)
+        return window.center - radius, window.center + radius
+    raise Exception("window must be a BoxWindow or a BallWindow")
+
+
+def _overlaps(window, box):
+    """Returns True if ``window`` and the BoxWindow ``box`` have at least one common point."""
+    lower, upper = box.bounds[:, 0], box.bounds[:, 1]
+    if isinstance(window, BoxWindow):
+        return bool(
+            np.all((window.bounds[:, 0] <= upper) & (lower <= window.bounds[:, 1]))
+        )
+    closest = np.clip(window.center, lower, upper)
+    return closest in window
+
+
+class GridIndex:
+    """Uniform grid over the bounding boxes of a collection of BoxWindow and BallWindow.
+
+    Each window is registered in every cell of side ``cell_size`` that its bounding box touches, so that a query only tests the windows registered in the cells it touches.
+    The final membership test is done by the windows themselves, hence the answers agree exactly with ``__contains__``, boundaries included.
+    The number of cells touched by a window grows like (width / cell_size)^d, the index is meant for low dimensional windows.
+    """
+
+    def __init__(self, cell_size):
+        """Constructor of an empty GridIndex
+
+        Args:
+            cell_size (float): side length of the cells of the grid.
+        """
+        if cell_size <= 0:
+            raise Exception("cell_size must be positive")
+        self.cell_size = cell_size
+        self.windows = {}
+        self._cells = {}
+        self._cell_ranges = {}
+        self._next_id = 0
+
+    def __len__(self):
+        """Returns the number of windows in the index.
+
+        Returns:
+            int: the number of windows
+        """
+        return len(self.windows)
+
+    def _cell(self, point):
+        """Returns the integer coordinates of the cell containing ``point``, or of the cells containing an array of points."""
+        return np.floor(np.asarray(point) / self.cell_size).astype(np.int64)
+
+    def _cells_between(self, lower_cell, upper_cell):
+        """Iterate over the cells between two cells, both included."""
+        ranges = [range(a, b + 1) for a, b in zip(lower_cell, upper_cell)]
+        return itertools.product(*ranges)
+
+    def insert(self, window):
+        """Add a window to the index.
+
+        Args:
+            window (BoxWindow or BallWindow): the window to add.
+
+        Returns:
+            int: the id of the window, used by :py:meth:`delete` and returned by the queries.
+        """
+        lower, upper = _bounding_box(window)
+        lower_cell, upper_cell = self._cell(lower), self._cell(upper)
+        window_id = self._next_id
+        self._next_id += 1
+        self.windows[window_id] = window
+        self._cell_ranges[window_id] = lower_cell, upper_cell
+        for cell in self._cells_between(lower_cell, upper_cell):
+            self._cells.setdefault(cell, set()).add(window_id)
+        return window_id
+
+    def delete(self, window_id):
+        """Remove a window from the index.
+
+        Args:
+            window_id (int): the id returned by :py:meth:`insert`.
+        """
+        del self.windows[window_id]
+        lower_cell, upper_cell = self._cell_ranges.pop(window_id)
+        for cell in self._cells_between(lower_cell, upper_cell):
+            ids = self._cells[cell]
+            ids.discard(window_id)
+            if not ids:
+                del self._cells[cell]
+
+    def query_points(self, points):
+        """Find the windows containing each point.
+
+        Points are grouped by cell, and each window registered in a cell is tested at once on all the points of the cell.
+
+        Args:
+            points (numpy.array): array of points of shape (N, d).
+
+        Returns:
+            list: list of N sorted lists of ids of the windows containing each point.
+        """
+        points = np.asarray(points)
+        hits = [[] for _ in range(len(points))]
+        if not len(points):
+            return hits
+        cells, inverse = np.unique(self._cell(points), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind="stable")
+        groups = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+        for cell, indices in zip(cells, groups):
+            for window_id in sorted(self._cells.get(tuple(cell), ())):
+                inside = self.windows[window_id].indicator_function(points[indices])
+                for i in indices[inside]:
+                    hits[i].append(window_id)
+        return hits
+
+    def query_box(self, box):
+        """Find the windows having at least one common point with ``box``.
+
+        Args:
+            box (BoxWindow): the query box.
+
+        Returns:
+            list: sorted list of ids of the windows overlapping ``box``.
+        """
+        lower_cell = self._cell(box.bounds[:, 0])
+        upper_cell = self._cell(box.bounds[:, 1])
+        if np.prod(upper_cell - lower_cell + 1) <= len(self._cells):
+            cells = self._cells_between(lower_cell, upper_cell)
+        else:
+            cells = (
+                cell
+                for cell in self._cells
+                if np.all((lower_cell <= cell) & (cell <= upper_cell))
+            )
+        candidates = set()
+        for cell in cells:
+            candidates.update(self._cells.get(cell, ()))
+        return sorted(i for i in candidates if _overlaps(self.windows[i], box))
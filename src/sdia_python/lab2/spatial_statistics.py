@@ -0,0 +1,141 @@
+import math
+
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.special import betainc
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+
+CORRECTIONS = ("auto", "none", "translation", "isotropic")
+
+
+def _unit_ball_volume(d):
+    """Returns the volume of the unit ball of dimension d."""
+    return math.pi ** (d / 2) / math.gamma(d / 2 + 1)
+
+
+def _translation_weights(window, differences):
+    """Returns |W| / |W ∩ (W + h)| for each difference h of a pair of points of the box W."""
+    return window.volume() / window.overlap_volume(differences)
+
+
+def _isotropic_weights(window, centers, distances):
+    """Returns the inverse of the fraction of the sphere of radius ``distances`` centered at ``centers`` lying in the ball W.
+
+    The part of the sphere outside W is a spherical cap around the direction from the center of W to the center of the sphere, whose relative area is given by the regularized incomplete beta function.
+    In dimension 1, the sphere is made of the two points at distance ``distances`` from ``centers``, so that the weight is 2 or 1 depending on whether both of them or only one lie in W.
+    """
+    d = window.dimension()
+    if d == 1:
+        offsets = centers[:, 0] - window.center[0]
+        inside = (np.abs(offsets - distances) <= window.radius).astype(int) + (
+            np.abs(offsets + distances) <= window.radius
+        )
+        # the other point of the pair lies in W, up to rounding errors
+        return 2 / np.maximum(inside, 1)
+    rho = np.linalg.norm(centers - window.center, axis=1)
+    # cosine of the half-angle of the cap, > 1 when the sphere lies in W
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos_beta = (window.radius_squared - rho ** 2 - distances ** 2) / (
+            2 * rho * distances
+        )
+    cos_beta = np.clip(np.nan_to_num(cos_beta, nan=1.0, posinf=1.0), -1, 1)
+    cap = 0.5 * betainc((d - 1) / 2, 0.5, 1 - cos_beta ** 2)
+    outside = np.where(cos_beta >= 0, cap, 1 - cap)
+    return 1 / (1 - outside)
+
+
+def _resolve_correction(window, correction):
+    """Returns the edge correction to apply on ``window``."""
+    if correction not in CORRECTIONS:
+        raise Exception(f"correction must be one of {CORRECTIONS}")
+    if correction == "auto":
+        if isinstance(window, BoxWindow):
+            return "translation"
+        if isinstance(window, BallWindow):
+            return "isotropic"
+        return "none"
+    if correction == "translation" and not isinstance(window, BoxWindow):
+        raise Exception("The translation correction requires a BoxWindow")
+    if correction == "isotropic" and not isinstance(window, BallWindow):
+        raise Exception("The isotropic correction requires a BallWindow")
+    return correction
+
+
+def _chunk_size(points, window, r_max, max_pairs):
+    """Returns the number of query points whose pairs closer than ``r_max`` are expected to be about ``max_pairs``, for points uniform in ``window``."""
+    n, d = points.shape
+    neighbors = n * _unit_ball_volume(d) * r_max ** d / window.volume()
+    return max(1, int(max_pairs / max(neighbors, 1)))
+
+
+def _pair_counts(points, window, radii, correction, max_pairs=2 ** 20):
+    """Returns, for each radius r of ``radii``, the sum of the edge correction weights of the ordered pairs (i, j), i != j, of points closer than r.
+
+    Without correction the pairs are counted by ``cKDTree.count_neighbors``.
+    Otherwise, the points are queried against a KD-tree by chunks holding about ``max_pairs`` close pairs, and the weights of each chunk are accumulated in a histogram over ``radii``, so that memory does not grow with the total number of pairs.
+    """
+    correction = _resolve_correction(window, correction)
+    tree = cKDTree(points)
+    if correction == "none":
+        # the ordered pairs (i, i) are counted too
+        return (tree.count_neighbors(tree, radii) - len(points)).astype(float)
+
+    chunk_size = _chunk_size(points, window, radii[-1], max_pairs)
+    histogram = np.zeros(len(radii) + 1)
+    for start in range(0, len(points), chunk_size):
+        chunk = cKDTree(points[start : start + chunk_size])
+        pairs = chunk.sparse_distance_matrix(tree, radii[-1], output_type="ndarray")
+        pairs = pairs[pairs["i"] + start != pairs["j"]]
+        x, y, distances = points[pairs["i"] + start], points[pairs["j"]], pairs["v"]
+        if correction == "translation":
+            weights = _translation_weights(window, x - y)
+        else:
+            weights = _isotropic_weights(window, x, distances)
+        # a pair closer than radii[k] is counted for radii[k], radii[k + 1], ...
+        bins = np.searchsorted(radii, distances, side="left")
+        histogram += np.bincount(bins, weights=weights, minlength=len(radii) + 1)
+    return np.cumsum(histogram)[: len(radii)]
+
+
+def ripley_k(points, window, radii, correction="auto"):
+    """Estimate Ripley's K function of a point pattern observed in ``window``.
+
+    Pairs of points are found with a KD-tree and counted once for all the radii, by chunks of query points, so that memory is bounded whatever the number of close pairs.
+    The estimator is K(r) = |W| / (N (N - 1)) * sum_{i != j} w_ij 1{|x_i - x_j| <= r} where w_ij is the edge correction weight.
+
+    Args:
+        points (numpy.array): array of shape (N, d) of points in ``window``.
+        window (BoxWindow or BallWindow): observation window.
+        radii (numpy.array): increasing radii at which K is estimated.
+        correction (str, optional): ``"translation"`` for a BoxWindow, ``"isotropic"`` for a BallWindow, ``"none"``, or ``"auto"`` to choose from the window. Defaults to "auto".
+
+    Returns:
+        numpy.array: the estimates of K at ``radii``.
+    """
+    radii = np.asarray(radii, dtype=float)
+    n = len(points)
+    counts = _pair_counts(points, window, radii, correction)
+    return window.volume() / (n * (n - 1)) * counts
+
+
+def pair_correlation(points, window, radii, correction="auto"):
+    """Estimate the pair correlation function of a point pattern observed in ``window``, on the shells between consecutive ``radii``.
+
+    The estimator is g = |W| / (N (N - 1)) * sum_{i != j} w_ij 1{r_k < |x_i - x_j| <= r_{k+1}} / |shell_k| where |shell_k| is the volume of the shell between r_k and r_{k+1}.
+
+    Args:
+        points (numpy.array): array of shape (N, d) of points in ``window``.
+        window (BoxWindow or BallWindow): observation window.
+        radii (numpy.array): increasing radii delimiting the shells.
+        correction (str, optional): see :py:func:`ripley_k`. Defaults to "auto".
+
+    Returns:
+        tuple: the centers of the shells and the estimates of g on the shells.
+    """
+    radii = np.asarray(radii, dtype=float)
+    k = ripley_k(points, window, radii, correction)
+    d = points.shape[1]
+    shells = _unit_ball_volume(d) * np.diff(radii ** d)
+    return (radii[1:] + radii[:-1]) / 2, np.diff(k) / shells
@@ -0,0 +1,63 @@
+import numpy as np
+
+from sdia_python.lab2.utils import get_random_number_generator
+
+
+def _chunk_seed_sequence(seed, k):
+    """Returns the seed sequence of the k-th chunk, equal to the k-th child spawned from the seed sequence ``seed``."""
+    return np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + (k,))
+
+
+def iter_rand(window, n, chunk_size=10 ** 6, seed=None, start_chunk=0):
+    """Generate n points uniformly at random inside ``window``, yielded by chunks of ``chunk_size`` points.
+
+    The k-th chunk is drawn from its own random stream, the k-th child of ``seed``, so that a chunk does not depend on the previous ones and the generation can be resumed from any chunk.
+
+    Args:
+        window (object): window with a ``rand`` method, e.g. a BoxWindow or a BallWindow.
+        n (int): total number of points.
+        chunk_size (int, optional): number of points per chunk, the last chunk may be smaller. Defaults to 10**6.
+        seed (int or numpy.random.SeedSequence, optional): root seed of the chunk streams, must be given for the output to be reproducible. Defaults to None.
+        start_chunk (int, optional): index of the first chunk to generate. Defaults to 0.
+
+    Yields:
+        numpy.array: chunks of points of shape (chunk_size, d).
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    n_chunks = -(-n // chunk_size)
+    for k in range(start_chunk, n_chunks):
+        rng = get_random_number_generator(_chunk_seed_sequence(seed, k))
+        yield window.rand(min(chunk_size, n - k * chunk_size), rng=rng)
+
+
+def write_rand(window, filename, n, chunk_size=10 ** 6, seed=None, start_chunk=0):
+    """Generate n points uniformly at random inside ``window`` and write them chunk by chunk to a ``.npy`` file, without holding more than one chunk in memory.
+
+    With ``start_chunk > 0``, the existing file is completed from the chunk ``start_chunk`` onwards, e.g. to resume an interrupted generation with the same ``seed``.
+    The result can be read without loading it with ``numpy.load(filename, mmap_mode="r")``.
+
+    Args:
+        window (object): window with a ``rand`` method, e.g. a BoxWindow or a BallWindow.
+        filename (str or pathlib.Path): path of the ``.npy`` file.
+        n (int): total number of points.
+        chunk_size (int, optional): number of points per chunk. Defaults to 10**6.
+        seed (int or numpy.random.SeedSequence, optional): root seed of the chunk streams, must be given for the output to be reproducible. Defaults to None.
+        start_chunk (int, optional): index of the first chunk to write. Defaults to 0.
+
+    Returns:
+        numpy.memmap: the array of shape (n, d) mapped on ``filename``.
+    """
+    shape = (n, window.dimension())
+    if start_chunk == 0:
+        out = np.lib.format.open_memmap(filename, mode="w+", shape=shape)
+    else:
+        out = np.lib.format.open_memmap(filename, mode="r+")
+        assert out.shape == shape
+
+    start = start_chunk * chunk_size
+    for chunk in iter_rand(window, n, chunk_size, seed, start_chunk):
+        out[start : start + len(chunk)] = chunk
+        start += len(chunk)
+        out.flush()
+    return out
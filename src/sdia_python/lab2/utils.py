@@ -4,3 +4,55 @@ import numpy as np
 def get_random_number_generator(seed):
     """Turn seed into a np.random.Generator instance."""
     return np.random.default_rng(seed)
+
+
+def spawn_seed_sequences(seed, n_children):
+    """Spawn ``n_children`` independent and reproducible seed sequences from ``seed``.
+
+    Each child can be turned into its own generator with :py:func:`get_random_number_generator`, e.g. in a separate worker process.
+
+    Args:
+        seed (int, numpy.random.SeedSequence or numpy.random.Generator): root seed, a generator is spawned from its own seed sequence.
+        n_children (int): number of child seed sequences.
+
+    Returns:
+        list: list of ``n_children`` numpy.random.SeedSequence.
+    """
+    if isinstance(seed, np.random.Generator):
+        seed_sequence = seed.bit_generator.seed_seq
+    elif isinstance(seed, np.random.SeedSequence):
+        seed_sequence = seed
+    else:
+        seed_sequence = np.random.SeedSequence(seed)
+    return seed_sequence.spawn(n_children)
+
+
+def read_only_copy(array):
+    """Return a copy of ``array`` which cannot be modified in place."""
+    array = np.array(array)
+    array.flags.writeable = False
+    return array
+
+
+class Immutable:
+    """Mixin for slotted classes whose attributes cannot be reassigned once the constructor has set them with ``_set``."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def _set(self, name, value):
+        """Set the attribute ``name``, only meant to be called by the constructor."""
+        object.__setattr__(self, name, value)
+
+    def __setstate__(self, state):
+        """Restore the attributes when unpickling, the arrays being made read-only again."""
+        _, slots = state
+        for name, value in slots.items():
+            if isinstance(value, np.ndarray):
+                value = read_only_copy(value)
+            self._set(name, value)
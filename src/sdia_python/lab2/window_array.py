@@ -0,0 +1,253 @@
+import math
+
+import numpy as np
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.utils import get_random_number_generator
+
+
+def _contains(chunk_mask, n_windows, points, sparse, chunk_size):
+    """Evaluate ``chunk_mask`` on chunks of ``points`` and gather the (K, N) mask, or its nonzero indices if ``sparse``."""
+    points = np.asarray(points)
+    if not sparse:
+        mask = np.empty((n_windows, len(points)), dtype=bool)
+        for start in range(0, len(points), chunk_size):
+            mask[:, start : start + chunk_size] = chunk_mask(
+                points[start : start + chunk_size]
+            )
+        return mask
+
+    window_ids, point_ids = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)]
+    for start in range(0, len(points), chunk_size):
+        k, i = np.nonzero(chunk_mask(points[start : start + chunk_size]))
+        window_ids.append(k)
+        point_ids.append(i + start)
+    return np.concatenate(window_ids), np.concatenate(point_ids)
+
+
+class BoxWindowArray:
+    """Collection of K boxes of the same dimension d, stored as a single (K, d, 2) array of bounds."""
+
+    def __init__(self, bounds):
+        """Constructor of a BoxWindowArray
+
+        Args:
+            bounds (numpy.array): The bounds of the boxes.
+                                It must be of dimension K * d * 2
+        """
+        assert isinstance(bounds, np.ndarray)
+        if bounds.ndim != 3 or bounds.shape[2] != 2:
+            raise Exception("The dimension of the argument bounds is not correct")
+        if not np.all(np.diff(bounds) >= 0):
+            raise Exception("The bounds are not in the right order")
+        self.bounds = bounds
+
+    @classmethod
+    def from_windows(cls, windows):
+        """Build a BoxWindowArray from a list of BoxWindow of the same dimension.
+
+        Args:
+            windows (list): list of BoxWindow.
+
+        Returns:
+            BoxWindowArray: the boxes stored as a single array.
+        """
+        return cls(np.array([w.bounds for w in windows], dtype=float))
+
+    def to_windows(self):
+        """Returns the list of BoxWindow stored in the array.
+
+        Returns:
+            list: list of BoxWindow.
+        """
+        return [BoxWindow(bounds) for bounds in self.bounds]
+
+    def __len__(self):
+        """Returns the number of boxes.
+
+        Returns:
+            int: the number of boxes
+        """
+        return len(self.bounds)
+
+    def dimension(self):
+        """Returns the dimension of the boxes.
+
+        Returns:
+            int: the dimension of the boxes
+        """
+        return self.bounds.shape[1]
+
+    def volume(self):
+        """Returns the volume of each box.
+
+        Returns:
+            numpy.array: array of shape (K,) of the volumes of the boxes
+        """
+        return np.prod(self.bounds[:, :, 1] - self.bounds[:, :, 0], axis=1)
+
+    def center(self):
+        """Returns the center of each box.
+
+        Returns:
+            numpy.array: array of shape (K, d) of the centers of the boxes
+        """
+        return np.sum(self.bounds, axis=2) / 2
+
+    def contains(self, points, sparse=False, chunk_size=1024):
+        """Test which boxes contain which points, the boundary being included.
+
+        Points are processed by chunks of ``chunk_size`` so that the temporary arrays have at most K * chunk_size * d elements.
+
+        Args:
+            points (numpy.array): array of points of shape (N, d).
+            sparse (bool, optional): return the indices of the hits instead of the full mask. Defaults to False.
+            chunk_size (int, optional): number of points processed at once. Defaults to 1024.
+
+        Returns:
+            numpy.array or tuple: boolean mask of shape (K, N), or the arrays ``(window_ids, point_ids)`` of the hits if ``sparse``.
+        """
+        a = self.bounds[:, None, :, 0]
+        b = self.bounds[:, None, :, 1]
+
+        def chunk_mask(chunk):
+            return np.all((a <= chunk) & (chunk <= b), axis=2)
+
+        return _contains(chunk_mask, len(self), points, sparse, chunk_size)
+
+    def rand(self, n_per_window=1, rng=None):
+        """Generate ``n_per_window`` points uniformly at random inside each box.
+
+        Args:
+            n_per_window (int, optional): the number of points per box. Defaults to 1.
+            rng (numpy.random._generator.Generator, optional): Random number generator. Defaults to None.
+
+        Returns:
+            numpy.array: array of shape (K, n_per_window, d) of points, the k-th slice lying in the k-th box.
+        """
+        rng = get_random_number_generator(rng)
+        lower = self.bounds[:, None, :, 0]
+        points = rng.random((len(self), n_per_window, self.dimension()))
+        points *= self.bounds[:, None, :, 1] - lower
+        points += lower
+        return points
+
+
+class BallWindowArray:
+    """Collection of K balls of the same dimension d, stored as a (K, d) array of centers and a (K,) array of radii."""
+
+    def __init__(self, centers, radii):
+        """Constructor of a BallWindowArray
+
+        Args:
+            centers (numpy.array): the centers of the balls, of dimension K * d.
+            radii (numpy.array): the radii of the balls, of dimension K.
+        """
+        assert isinstance(centers, np.ndarray)
+        radii = np.asarray(radii)
+        if centers.ndim != 2 or radii.shape != (len(centers),):
+            raise Exception("The dimensions of the arguments are not correct")
+        if np.any(radii < 0):
+            raise Exception("radius must be positive")
+        self.centers = centers
+        self.radii = radii
+        self.radii_squared = radii ** 2
+
+    @classmethod
+    def from_windows(cls, windows):
+        """Build a BallWindowArray from a list of BallWindow of the same dimension.
+
+        Args:
+            windows (list): list of BallWindow.
+
+        Returns:
+            BallWindowArray: the balls stored as arrays.
+        """
+        centers = np.array([w.center for w in windows], dtype=float)
+        radii = np.array([w.radius for w in windows], dtype=float)
+        return cls(centers, radii)
+
+    def to_windows(self):
+        """Returns the list of BallWindow stored in the array.
+
+        Returns:
+            list: list of BallWindow.
+        """
+        return [BallWindow(c, r) for c, r in zip(self.centers, self.radii)]
+
+    def __len__(self):
+        """Returns the number of balls.
+
+        Returns:
+            int: the number of balls
+        """
+        return len(self.centers)
+
+    def dimension(self):
+        """Returns the dimension of the balls.
+
+        Returns:
+            int: the dimension of the balls
+        """
+        return self.centers.shape[1]
+
+    def volume(self):
+        """Returns the volume of each ball, computed in log space so that it overflows to inf instead of raising in high dimension.
+
+        Returns:
+            numpy.array: array of shape (K,) of the volumes of the balls
+        """
+        d = self.dimension()
+        log_unit_volume = d / 2 * math.log(math.pi) - math.lgamma(d / 2 + 1)
+        with np.errstate(divide="ignore", over="ignore"):
+            return np.exp(log_unit_volume + d * np.log(self.radii))
+
+    def center(self):
+        """Returns the center of each ball.
+
+        Returns:
+            numpy.array: array of shape (K, d) of the centers of the balls
+        """
+        return self.centers
+
+    def contains(self, points, sparse=False, chunk_size=1024):
+        """Test which balls contain which points, the boundary being included.
+
+        Squared distances are compared to the squared radii, and points are processed by chunks of ``chunk_size`` so that the temporary arrays have at most K * chunk_size * d elements.
+
+        Args:
+            points (numpy.array): array of points of shape (N, d).
+            sparse (bool, optional): return the indices of the hits instead of the full mask. Defaults to False.
+            chunk_size (int, optional): number of points processed at once. Defaults to 1024.
+
+        Returns:
+            numpy.array or tuple: boolean mask of shape (K, N), or the arrays ``(window_ids, point_ids)`` of the hits if ``sparse``.
+        """
+        centers = self.centers[:, None, :]
+        radii_squared = self.radii_squared[:, None]
+
+        def chunk_mask(chunk):
+            diff = chunk - centers
+            return np.einsum("kij,kij->ki", diff, diff) <= radii_squared
+
+        return _contains(chunk_mask, len(self), points, sparse, chunk_size)
+
+    def rand(self, n_per_window=1, rng=None):
+        """Generate ``n_per_window`` points uniformly at random inside each ball.
+
+        Args:
+            n_per_window (int, optional): the number of points per ball. Defaults to 1.
+            rng (numpy.random._generator.Generator, optional): Random number generator. Defaults to None.
+
+        Returns:
+            numpy.array: array of shape (K, n_per_window, d) of points, the k-th slice lying in the k-th ball.
+        """
+        rng = get_random_number_generator(rng)
+        K, d = self.centers.shape
+        points = rng.standard_normal((K, n_per_window, d))
+        points /= np.linalg.norm(points, axis=2, keepdims=True)
+        radii = self.radii[:, None, None] * rng.random((K, n_per_window, 1)) ** (1 / d)
+        points *= radii
+        points += self.centers[:, None, :]
+        return points
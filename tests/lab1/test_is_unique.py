@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from sdia_python.lab1.functions import is_unique
@@ -9,3 +10,66 @@ from sdia_python.lab1.functions import is_unique
 )
 def test_is_unique(items, expected):
     assert is_unique(items) == expected
+
+
+@pytest.mark.parametrize(
+    "items, expected",
+    (
+        (np.array([]), True),
+        (np.array([3, 1, 2]), True),
+        (np.array([3, 1, 3]), False),
+        (np.array([[1, 2], [3, 4]]), True),
+        (np.array([[1, 2], [3, 1]]), False),
+    ),
+)
+def test_is_unique_array(items, expected):
+    assert is_unique(items) == expected
+
+
+@pytest.mark.parametrize(
+    "items, axis, expected",
+    (
+        (np.array([[1, 2], [2, 1], [1, 3]]), 0, True),
+        (np.array([[1, 2], [2, 1], [1, 2]]), 0, False),
+        (np.array([[1, 1], [2, 2]]), 1, False),
+        (np.array([[1, 2], [1, 3]]), 1, True),
+    ),
+)
+def test_is_unique_array_axis(items, axis, expected):
+    assert is_unique(items, axis=axis) == expected
+
+
+def test_is_unique_generator():
+    assert is_unique(i for i in range(100))
+    assert not is_unique(i % 50 for i in range(100))
+
+
+def test_is_unique_stops_at_first_duplicate():
+    consumed = []
+
+    def items():
+        for i in [1, 2, 1, 3, 4]:
+            consumed.append(i)
+            yield i
+
+    assert not is_unique(items())
+    assert consumed == [1, 2, 1]
+
+
+def test_is_unique_list_of_arrays():
+    assert is_unique([np.array([1, 2]), np.array([2, 1])])
+    assert not is_unique([np.array([1, 2]), np.array([1, 2])])
+
+
+@pytest.mark.parametrize("duplicate", (None, 0, 500, 999))
+def test_is_unique_spilling_to_disk(duplicate):
+    items = list(range(1000))
+    if duplicate is not None:
+        items.append(duplicate)
+    expected = duplicate is None
+    assert is_unique(iter(items), max_items_in_memory=100, n_partitions=8) == expected
+
+
+def test_is_unique_spilling_to_disk_strings():
+    items = (f"item-{i % 700}" for i in range(701))
+    assert not is_unique(items, max_items_in_memory=50)
@@ -1,6 +1,12 @@
+import io
+
 import pytest
 
-from sdia_python.lab1.functions import triangle_shape
+from sdia_python.lab1.functions import (
+    iter_triangle_shape,
+    triangle_shape,
+    write_triangle_shape,
+)
 
 triangle_strings = [
     "",
@@ -26,3 +32,50 @@ triangle_strings = [
 def test_triangle_shape(height, expected):
     shape = triangle_shape(height)
     assert shape == expected
+
+
+@pytest.mark.parametrize("height, expected", enumerate(triangle_strings))
+def test_iter_triangle_shape(height, expected):
+    rows = list(iter_triangle_shape(height))
+    assert rows == (expected.split("\n") if height else [])
+
+
+@pytest.mark.parametrize("buffer_size", (1, 10, 2 ** 16))
+@pytest.mark.parametrize("height, expected", enumerate(triangle_strings))
+def test_write_triangle_shape(height, expected, buffer_size):
+    file = io.StringIO()
+    written = write_triangle_shape(file, height, buffer_size=buffer_size)
+    assert file.getvalue() == expected
+    assert written == len(expected)
+
+
+def test_triangle_shape_custom_chars():
+    expected = "\n".join(
+        ("*" * (2 * i + 1)).center(2 * 50 - 1, "_") for i in range(50)
+    )
+    assert triangle_shape(50, fillchar="*", spacechar="_") == expected
+
+
+def _center_triangle_shape(n, fillchar, spacechar):
+    width = 2 * n - 1
+    return "\n".join(
+        (fillchar * (2 * i + 1)).center(width, spacechar) for i in range(n)
+    )
+
+
+@pytest.mark.parametrize("fillchar", ("ab", ""))
+@pytest.mark.parametrize("height", (0, 1, 3, 6))
+def test_triangle_shape_multichar_fillchar(height, fillchar):
+    expected = _center_triangle_shape(height, fillchar, " ")
+    assert triangle_shape(height, fillchar=fillchar) == expected
+    file = io.StringIO()
+    write_triangle_shape(file, height, fillchar=fillchar)
+    assert file.getvalue() == expected
+
+
+@pytest.mark.parametrize("spacechar", ("ab", ""))
+def test_triangle_shape_multichar_spacechar(spacechar):
+    with pytest.raises(TypeError):
+        _center_triangle_shape(3, "x", spacechar)
+    with pytest.raises(TypeError):
+        triangle_shape(3, spacechar=spacechar)
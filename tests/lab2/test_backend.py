@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from sdia_python.lab2 import backend
+from sdia_python.lab2.backend import get_backend, set_backend
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+
+
+@pytest.fixture
+def restore_backend():
+    default = backend._default_backend
+    yield
+    set_backend(default)
+
+
+@pytest.fixture(
+    params=[
+        BoxWindow(np.array([[0, 1], [-2, 2], [3, 3.5]])),
+        BallWindow(np.array([3.5, 2.5, 1.25]), 0.5),
+    ]
+)
+def window(request):
+    return request.param
+
+
+def test_raise_Exception_when_backend_is_unknown():
+    with pytest.raises(Exception):
+        get_backend("cython")
+
+
+def test_set_backend(restore_backend):
+    set_backend("numpy")
+    assert get_backend() == "numpy"
+    assert get_backend("numba") in ("numpy", "numba")
+
+
+def test_fallback_when_numba_is_missing(monkeypatch, window):
+    monkeypatch.setattr(backend, "numba", None)
+    assert get_backend("auto") == "numpy"
+    with pytest.warns(UserWarning):
+        assert get_backend("numba") == "numpy"
+    points = np.random.default_rng(0).uniform(-3, 4, size=(100, 3))
+    with pytest.warns(UserWarning):
+        mask = window.indicator_function(points, backend="numba")
+    assert np.array_equal(mask, window.indicator_function(points))
+
+
+def test_backends_agree_on_indicator_function(window):
+    pytest.importorskip("numba")
+    points = np.random.default_rng(1).uniform(-3, 4, size=(10000, 3))
+    expected = window.indicator_function(points, backend="numpy")
+    assert np.array_equal(window.indicator_function(points, backend="numba"), expected)
+
+
+def test_backends_agree_on_rand(window):
+    pytest.importorskip("numba")
+    expected = window.rand(1000, rng=2, backend="numpy")
+    points = window.rand(1000, rng=2, backend="numba")
+    assert np.allclose(points, expected)
+    assert np.all(window.indicator_function(points))
+
+
+def test_global_numba_backend(restore_backend, window):
+    pytest.importorskip("numba")
+    set_backend("auto")
+    assert get_backend() == "numba"
+    points = window.rand(100, rng=3)
+    assert np.all(window.indicator_function(points))
@@ -1,10 +1,15 @@
+import math
+import pickle
+
 import numpy as np
 from numpy.core.defchararray import _center_dispatcher
 from numpy.lib.twodim_base import triu_indices_from
 import pytest
 
+from sdia_python.lab2 import ball_samplers
 from sdia_python.lab2.ball_window import BallWindow, UnitBallWindow
 from sdia_python.lab2.box_window import BoxWindow, UnitBoxWindow
+from sdia_python.lab2.composite import EmptyWindow
 
 
 def test_raise_assertion_error_when_center_is_not_an_array():
@@ -22,11 +27,10 @@ def test_raise_Exception_when_radius_is_negative():
         raise Exception
 
 
-def test_raise_Exception_when_dimension_is_to_high():
-    with pytest.raises(Exception):
-        L = np.array([3, 4, 5, 6])
-        ball = BallWindow(L, 2)
-        raise Exception
+@pytest.mark.parametrize("d", [4, 5, 20, 50])
+def test_high_dimension(d):
+    ball = BallWindow(np.zeros(d), 2)
+    assert ball.dimension() == d
 
 
 @pytest.mark.parametrize(
@@ -57,11 +61,39 @@ def test_dimension_box(box, expected):
         (np.array([1]), 2, 4),
         (np.array([1, 3]), 2.5, np.pi * 2.5 ** 2),
         (np.array([1.4, 2.6, 3.9]), 3.12, (4 / 3) * np.pi * 3.12 ** 3),
+        (np.zeros(4), 1.5, np.pi ** 2 / 2 * 1.5 ** 4),
+        (np.zeros(5), 0.5, 8 * np.pi ** 2 / 15 * 0.5 ** 5),
     ],
 )
 def test_volume_box(center, radius, expected):
     ball = BallWindow(center, radius)
-    assert ball.volume() == expected
+    assert ball.volume() == pytest.approx(expected)
+    assert ball.log_volume() == pytest.approx(np.log(expected))
+
+
+def test_log_volume_high_dimension():
+    ball = BallWindow(np.zeros(1000), 0.1)
+    assert ball.volume() == 0
+    assert np.isfinite(ball.log_volume())
+
+
+def test_volume_overflows_to_inf():
+    ball = BallWindow(np.zeros(400), radius=100.0)
+    assert ball.volume() == np.inf
+    assert ball.log_volume() == pytest.approx(
+        200 * np.log(np.pi) - math.lgamma(201) + 400 * np.log(100)
+    )
+    # large volumes still representable as floats are not lost
+    assert np.isfinite(BallWindow(np.zeros(400), radius=10.0).volume())
+
+
+@pytest.mark.parametrize(
+    "d, radius", [(20, np.int64(100)), (200, np.float64(100.0)), (3, np.int64(2))]
+)
+def test_volume_numpy_scalar_radius(d, radius):
+    ball = BallWindow(np.zeros(d), radius)
+    assert ball.volume() == pytest.approx(math.exp(ball.log_volume()))
+    assert ball.volume() == BallWindow(np.zeros(d), float(radius)).volume()
 
 
 @pytest.mark.parametrize(
@@ -208,3 +240,196 @@ def test_unit_ball_window_3D_volume():
 def test_unit_ball_window_2D_volume():
     ball = UnitBallWindow(np.array([0, 0]))
     assert ball.volume() == np.pi
+
+
+def test_indicator_function_multiple_points():
+    ball = BallWindow(np.array([0, 0]), 1)
+    points = np.array([[0.5, 0.5], [1, 2], [1, 0], [0, -1.01]])
+    expected = np.array([True, False, True, False])
+    assert np.array_equal(ball.indicator_function(points), expected)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_indicator_function_matches_contains(chunk_size):
+    ball = BallWindow(np.array([3.5, 2.5, 1.25]), 0.5)
+    points = np.random.default_rng(0).uniform(2.5, 4.5, size=(500, 3))
+    mask = ball.indicator_function(points, chunk_size=chunk_size)
+    assert mask.shape == (500,)
+    assert np.array_equal(mask, [point in ball for point in points])
+
+
+def test_unit_ball_window_indicator_function():
+    ball = UnitBallWindow(np.array([1, 1]))
+    points = np.array([[1, 2], [1.5, 1.5], [2, 2]])
+    assert np.array_equal(ball.indicator_function(points), [True, True, False])
+
+
+@pytest.mark.parametrize("d", [1, 2, 3, 5, 20])
+def test_rand_high_dimension(d):
+    ball = BallWindow(np.full(d, 2.0), 3)
+    points = ball.rand(1000, rng=0)
+    assert points.shape == (1000, d)
+    assert np.all(ball.indicator_function(points))
+
+
+@pytest.mark.parametrize("d", [2, 3, 5])
+def test_rand_is_uniform_in_radius(d):
+    ball = BallWindow(np.zeros(d), 2)
+    points = ball.rand(100000, rng=1)
+    inner = BallWindow(np.zeros(d), 1)
+    assert np.mean(inner.indicator_function(points)) == pytest.approx(
+        0.5 ** d, abs=0.01
+    )
+
+
+def test_rand_three_dimension_is_uniform_on_polar_caps():
+    ball = BallWindow(np.zeros(3), 1)
+    points = ball.rand(100000, rng=2)
+    # volume fraction of the cap {z > 1/2} of the unit ball
+    assert np.mean(points[:, 2] > 0.5) == pytest.approx(0.15625, abs=0.01)
+
+
+@pytest.fixture
+def restore_calibration():
+    calibration = dict(BallWindow._calibration)
+    yield
+    BallWindow._calibration.clear()
+    BallWindow._calibration.update(calibration)
+
+
+@pytest.mark.parametrize(
+    "sampler, d",
+    [
+        (sampler, d)
+        for sampler in BallWindow.samplers
+        for d in (1, 2, 3, 5)
+        if sampler in BallWindow.available_samplers(d)
+    ],
+)
+def test_samplers_are_uniform(sampler, d):
+    ball = BallWindow(np.full(d, -1.0), 2)
+    points = ball.rand(50000, rng=5, sampler=sampler)
+    assert points.shape == (50000, d)
+    assert np.all(ball.indicator_function(points))
+    assert np.allclose(points.mean(axis=0), ball.center, atol=0.05)
+    inner = BallWindow(ball.center, 1)
+    assert np.mean(inner.indicator_function(points)) == pytest.approx(
+        0.5 ** d, abs=0.01
+    )
+    if d == 3:
+        # volume fraction of the cap {z > c_z + r/2} of the ball
+        cap = points[:, 2] > ball.center[2] + 1
+        assert np.mean(cap) == pytest.approx(0.15625, abs=0.01)
+
+
+def test_raise_Exception_when_sampler_does_not_support_dimension():
+    with pytest.raises(Exception):
+        BallWindow(np.zeros(4), 1).rand(10, sampler="polar")
+    with pytest.raises(Exception):
+        BallWindow(np.zeros(4), 1).rand(10, sampler="rejection")
+
+
+def test_rejection_batches_are_capped(monkeypatch):
+    monkeypatch.setattr(ball_samplers, "MAX_BATCH_SIZE", 100)
+    points = ball_samplers.rejection(1000, 3, np.random.default_rng(7))
+    assert points.shape == (1000, 3)
+    assert np.all(np.einsum("ij,ij->i", points, points) <= 1)
+
+
+def test_register_sampler():
+    def origin(n, d, rng):
+        return np.zeros((n, d))
+
+    BallWindow.register_sampler("origin", origin, max_dimension=2)
+    try:
+        assert "origin" in BallWindow.available_samplers(2)
+        assert "origin" not in BallWindow.available_samplers(3)
+        points = BallWindow(np.array([1, 2]), 3).rand(5, sampler="origin")
+        assert np.array_equal(points, np.tile([1, 2], (5, 1)))
+    finally:
+        del BallWindow.samplers["origin"]
+
+
+def test_select_sampler_without_calibration(restore_calibration):
+    BallWindow._calibration.clear()
+    assert BallWindow.select_sampler(2, 1000) == "rejection"
+    assert BallWindow.select_sampler(20, 1000) == "gaussian"
+
+
+def test_calibrate_samplers(restore_calibration):
+    calibration = BallWindow.calibrate_samplers(
+        dimensions=(2, 20), sizes=(100,), repeat=1
+    )
+    assert set(calibration) >= {(2, 100), (20, 100)}
+    assert calibration[(20, 100)] == "gaussian"
+    assert BallWindow.select_sampler(20, 10 ** 4) == "gaussian"
+    ball = BallWindow(np.zeros(2), 1)
+    assert np.all(ball.indicator_function(ball.rand(100, rng=6, sampler="auto")))
+
+
+def test_ball_is_immutable():
+    center = np.array([0, 1])
+    ball = BallWindow(center, 2)
+    center[0] = 5
+    assert ball.center[0] == 0
+    with pytest.raises(ValueError):
+        ball.center[0] = 5
+    with pytest.raises(AttributeError):
+        ball.radius = 3
+    assert not hasattr(ball, "__dict__")
+
+
+def test_ball_equality_and_hash():
+    ball = BallWindow(np.array([0, 1]), 1)
+    same = UnitBallWindow(np.array([0.0, 1.0]))
+    assert ball == same and hash(ball) == hash(same)
+    assert ball != BallWindow(np.array([0, 1]), 2)
+    assert ball != BoxWindow(np.array([[0, 1], [2, 3]]))
+    cache = {ball: "value"}
+    assert cache[same] == "value"
+
+
+def test_ball_pickle_round_trip():
+    ball = BallWindow(np.array([1.5, -2]), 3)
+    copy = pickle.loads(pickle.dumps(ball))
+    assert copy == ball
+    assert copy.volume() == ball.volume()
+    assert copy.dimension() == 2
+
+
+def test_signed_distance_ball():
+    ball = BallWindow(np.array([1, 1]), 2)
+    assert ball.signed_distance(np.array([1, 1])) == pytest.approx(-2)
+    assert ball.signed_distance(np.array([1, 3])) == pytest.approx(0)
+    assert ball.signed_distance(np.array([4, 5])) == pytest.approx(3)
+    points = np.random.default_rng(0).uniform(-2, 4, size=(1000, 2))
+    distances = ball.signed_distance(points)
+    assert np.array_equal(distances <= 0, ball.indicator_function(points))
+    assert np.array_equal(distances <= -0.5, ball.erode(0.5).indicator_function(points))
+    assert np.array_equal(distances <= 0.5, ball.dilate(0.5).indicator_function(points))
+
+
+def test_dilate_and_erode_ball():
+    ball = UnitBallWindow(np.array([1, 1, 0]))
+    assert ball.dilate(1) == BallWindow(np.array([1, 1, 0]), 2)
+    assert ball.erode(0.5) == BallWindow(np.array([1, 1, 0]), 0.5)
+    assert ball.erode(1).volume() == 0
+    assert isinstance(ball.erode(1.5), EmptyWindow)
+
+
+@pytest.mark.parametrize("d", [1, 2, 3, 5])
+def test_overlap_volume_ball(d):
+    ball = BallWindow(np.zeros(d), 1.5)
+    rng = np.random.default_rng(d)
+    shifts = rng.normal(size=(4, d))
+    expected = []
+    # Monte Carlo estimation of |B ∩ (B + h)| with points of B
+    points = ball.rand(10 ** 5, rng=rng)
+    for shift in shifts:
+        inside = np.linalg.norm(points - shift, axis=1) <= ball.radius
+        expected.append(ball.volume() * inside.mean())
+    assert np.allclose(ball.overlap_volume(shifts), expected, rtol=0.03, atol=0.01)
+    assert ball.overlap_volume(np.zeros(d)) == pytest.approx(ball.volume())
+    assert ball.overlap_volume(np.full(d, 3.0)) == 0
+    if d == 1:
+        assert ball.overlap_volume(np.array([1.0])) == pytest.approx(2)
@@ -0,0 +1,60 @@
+import json
+
+import numpy as np
+import pytest
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.benchmark import OPERATIONS, compare, main, run_benchmarks
+
+
+@pytest.fixture
+def baseline():
+    return {
+        "BoxWindow.rand[n=10,d=2]": {"throughput": 1000.0, "peak_memory": 100},
+        "BallWindow.rand[n=10,d=2]": {"throughput": 1000.0, "peak_memory": 100},
+    }
+
+
+def test_run_benchmarks_keys_and_metrics():
+    results = run_benchmarks(sizes=(10,), dimensions=(2,), repeat=1)
+    assert "UnitBallWindow.__contains__[n=10,d=2]" in results
+    assert "get_random_number_generator[n=10]" in results
+    for metrics in results.values():
+        assert metrics["throughput"] > 0
+        assert metrics["peak_memory"] >= 0
+
+
+@pytest.mark.parametrize("operation", ["indicator_function", "__contains__"])
+def test_query_points_are_drawn_outside_the_timed_function(operation):
+    rng = np.random.default_rng(0)
+    run = OPERATIONS[operation](BallWindow(np.zeros(2), 2), 10, rng)
+    state = rng.bit_generator.state
+    assert run() == 10
+    assert rng.bit_generator.state == state
+
+
+def test_compare_without_regression(baseline):
+    results = {
+        "BoxWindow.rand[n=10,d=2]": {"throughput": 850.0, "peak_memory": 110},
+        "BallWindow.rand[n=10,d=2]": {"throughput": 2000.0, "peak_memory": 50},
+    }
+    assert compare(results, baseline, threshold=0.2) == []
+
+
+def test_compare_detects_regressions(baseline):
+    results = {
+        "BoxWindow.rand[n=10,d=2]": {"throughput": 500.0, "peak_memory": 100},
+        "BallWindow.rand[n=10,d=2]": {"throughput": 1000.0, "peak_memory": 200},
+    }
+    regressions = compare(results, baseline, threshold=0.2)
+    assert len(regressions) == 2
+    assert "throughput" in regressions[0]
+    assert "peak memory" in regressions[1]
+
+
+def test_main_saves_and_compares(tmp_path):
+    output = tmp_path / "baseline.json"
+    args = ["--sizes", "10", "--dimensions", "2", "--repeat", "1"]
+    assert main(args + ["--output", str(output)]) == 0
+    assert "BoxWindow.volume[n=10,d=2]" in json.loads(output.read_text())
+    assert main(args + ["--baseline", str(output), "--threshold", "1e9"]) == 0
@@ -1,8 +1,10 @@
 from os import error
+import pickle
 import numpy as np
 import pytest
 
 from sdia_python.lab2.box_window import BoxWindow, UnitBoxWindow
+from sdia_python.lab2.composite import EmptyWindow
 
 
 def test_raise_assertion_error_when_points_is_not_an_array():
@@ -203,3 +205,147 @@ def test_UnitBoxWindow_with_center_specified(center, expected):
 def test_UnitBoxWindow_volume_is_equal_to_one(center):
     unitBox = UnitBoxWindow(center)
     assert unitBox.volume() == 1
+
+
+def test_indicator_function_box_2d_multiple_points(box_2d_05):
+    points = np.array([[0, 0], [2.5, 2.5], [-1, 5], [10, 3], [5, 5]])
+    expected = np.array([True, True, False, False, True])
+    assert np.array_equal(box_2d_05.indicator_function(points), expected)
+
+
+def test_indicator_function_matches_contains():
+    box = BoxWindow(np.array([[0, 1], [-2, 2], [3, 3.5]]))
+    points = np.random.default_rng(0).uniform(-3, 4, size=(1000, 3))
+    mask = box.indicator_function(points)
+    assert mask.shape == (1000,)
+    assert np.array_equal(mask, [point in box for point in points])
+
+
+def test_indicator_function_with_preallocated_output(box_2d_05):
+    points = np.array([[0, 0], [-1, 5], [10, 3]])
+    out = np.empty(3, dtype=bool)
+    mask = box_2d_05.indicator_function(points, out=out)
+    assert mask is out
+    assert np.array_equal(out, [True, False, False])
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_rand_shape_and_dtype(dtype):
+    box = BoxWindow(np.array([[1, 2], [10, 15.5], [3.5, 7]]))
+    points = box.rand(1000, rng=0, dtype=dtype)
+    assert points.shape == (1000, 3)
+    assert points.dtype == dtype
+    assert np.all(box.indicator_function(points))
+
+
+def test_rand_matches_coordinatewise_uniform_draws():
+    box = BoxWindow(np.array([[1, 2], [10, 15.5], [3.5, 7]]))
+    rng = np.random.default_rng(42)
+    expected = np.array([[rng.uniform(a, b) for a, b in box.bounds] for _ in range(50)])
+    assert np.allclose(box.rand(50, rng=42), expected)
+
+
+def test_rand_with_preallocated_output():
+    box = BoxWindow(np.array([[0, 1], [-2, 2]]))
+    out = np.empty((20, 2), dtype=np.float32)
+    points = box.rand(20, rng=0, out=out)
+    assert points is out
+    assert np.all(box.indicator_function(out))
+
+
+def test_box_is_immutable():
+    bounds = np.array([[0, 1], [2, 3]])
+    box = BoxWindow(bounds)
+    bounds[0, 0] = -10
+    assert box.bounds[0, 0] == 0
+    with pytest.raises(ValueError):
+        box.bounds[0, 0] = -10
+    with pytest.raises(AttributeError):
+        box.bounds = bounds
+    assert not hasattr(box, "__dict__")
+
+
+def test_box_cached_quantities():
+    box = BoxWindow(np.array([[1, 2], [3, 5], [5, 9]]))
+    assert box.volume() == 8
+    assert np.array_equal(box.widths(), [1, 2, 4])
+    assert box.center() is box.center()
+
+
+def test_box_equality_and_hash():
+    box = BoxWindow(np.array([[0, 1], [2, 3]]))
+    same = BoxWindow(np.array([[0.0, 1.0], [2.0, 3.0]]))
+    other = BoxWindow(np.array([[0, 1], [2, 4]]))
+    assert box == same and hash(box) == hash(same)
+    assert box != other
+    assert UnitBoxWindow(np.array([0.5, 2.5])) == box
+    assert len({box, same, other}) == 2
+
+
+def test_box_pickle_round_trip():
+    box = UnitBoxWindow(np.array([0.5, 2.5]))
+    copy = pickle.loads(pickle.dumps(box))
+    assert copy == box and type(copy) is UnitBoxWindow
+    assert copy.volume() == 1
+    with pytest.raises(ValueError):
+        copy.bounds[0, 0] = 1
+
+
+@pytest.mark.parametrize(
+    "point, expected",
+    [
+        (np.array([1, 1]), -1),
+        (np.array([0.5, 2]), -0.5),
+        (np.array([0, 1]), 0),
+        (np.array([-1, 1]), 1),
+        (np.array([-3, 7]), 5),
+    ],
+)
+def test_signed_distance_box(point, expected):
+    box = BoxWindow(np.array([[0, 2], [0, 3]]))
+    assert box.signed_distance(point) == pytest.approx(expected)
+
+
+def test_signed_distance_box_matches_indicator_function():
+    box = BoxWindow(np.array([[0, 2], [0, 3], [-1, 1]]))
+    points = np.random.default_rng(0).uniform(-2, 4, size=(1000, 3))
+    distances = box.signed_distance(points)
+    assert distances.shape == (1000,)
+    assert np.array_equal(distances <= 0, box.indicator_function(points))
+    # the eroded box contains the points farther than r from the boundary
+    r = 0.3
+    assert np.array_equal(distances <= -r, box.erode(r).indicator_function(points))
+
+
+def test_erode_and_dilated_bounding_box():
+    box = BoxWindow(np.array([[0, 2], [0, 3]]))
+    assert box.dilated_bounding_box(1) == BoxWindow(np.array([[-1, 3], [-1, 4]]))
+    assert box.erode(0.5) == BoxWindow(np.array([[0.5, 1.5], [0.5, 2.5]]))
+    assert box.erode(0.5).volume() == pytest.approx(2)
+    assert box.erode(1) == BoxWindow(np.array([[1, 1], [1, 2]]))
+    assert isinstance(box.erode(1.5), EmptyWindow)
+    # growing a box is not an erosion, see dilated_bounding_box
+    with pytest.raises(AssertionError):
+        box.erode(-1)
+
+
+def test_overlap_volume_box():
+    box = BoxWindow(np.array([[0, 2], [0, 3]]))
+    shifts = np.array([[0, 0], [1, -1], [2, 0], [-3, 0.5]])
+    assert np.allclose(box.overlap_volume(shifts), [6, 2, 0, 0])
+    for shift in shifts:
+        moved = BoxWindow(box.bounds + shift[:, None])
+        assert box.overlap_volume(shift) == pytest.approx((box & moved).volume())
+
+
+def test_dilated_bounding_box_contains_r_neighbourhood():
+    box = BoxWindow(np.array([[0, 2], [0, 3]]))
+    r = 0.5
+    points = np.random.default_rng(1).uniform(-1, 4, size=(2000, 2))
+    grown = box.dilated_bounding_box(r).indicator_function(points)
+    near = box.signed_distance(points) <= r
+    assert np.all(grown[near])
+    # but it is not the r-neighbourhood near the corners
+    corner = np.array([-0.5, -0.5])
+    assert corner in box.dilated_bounding_box(r)
+    assert box.signed_distance(corner) > r
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.composite import (
+    DifferenceWindow,
+    EmptyWindow,
+    IntersectionWindow,
+    UnionWindow,
+)
+
+
+@pytest.fixture
+def box_a():
+    return BoxWindow(np.array([[0, 2], [0, 2]]))
+
+
+@pytest.fixture
+def box_b():
+    return BoxWindow(np.array([[1, 3], [-1, 1]]))
+
+
+@pytest.fixture
+def disk():
+    return BallWindow(np.array([2, 2]), 1)
+
+
+@pytest.fixture
+def points():
+    return np.random.default_rng(0).uniform(-2, 4, size=(2000, 2))
+
+
+def test_box_intersection_is_closed_form(box_a, box_b):
+    box = box_a & box_b
+    assert isinstance(box, BoxWindow)
+    assert np.array_equal(box.bounds, [[1, 2], [0, 1]])
+
+
+def test_disjoint_boxes_intersection_is_empty(box_a):
+    empty = box_a & BoxWindow(np.array([[3, 4], [0, 1]]))
+    assert isinstance(empty, EmptyWindow)
+    assert empty.volume() == 0
+    assert np.array([1, 1]) not in empty
+    assert (empty | box_a) is box_a
+    assert (box_a - empty) is box_a
+
+
+@pytest.mark.parametrize(
+    "operator, expected_class, combine",
+    [
+        (lambda a, b: a & b, IntersectionWindow, np.logical_and),
+        (lambda a, b: a | b, UnionWindow, np.logical_or),
+        (lambda a, b: a - b, DifferenceWindow, lambda x, y: x & ~y),
+    ],
+)
+def test_membership(box_a, disk, points, operator, expected_class, combine):
+    window = operator(box_a, disk)
+    assert isinstance(window, expected_class)
+    expected = combine(
+        box_a.indicator_function(points), disk.indicator_function(points)
+    )
+    assert np.array_equal(window.indicator_function(points), expected)
+    assert [p in window for p in points[:50]] == list(expected[:50])
+
+
+def test_exact_volumes(box_a, box_b):
+    assert (box_a | box_b).volume() == 7
+    assert (box_a - box_b).volume() == 3
+    far_disk = BallWindow(np.array([10, 10]), 1)
+    assert (box_a & far_disk).volume() == 0
+    assert (box_a | far_disk).volume() == pytest.approx(4 + np.pi)
+
+
+def test_monte_carlo_volume(box_a, disk):
+    # a quarter of the disk lies in the box
+    assert (box_a & disk).volume(rng=1) == pytest.approx(np.pi / 4, rel=0.01)
+    assert (box_a - disk).volume(rng=2) == pytest.approx(4 - np.pi / 4, rel=0.01)
+
+
+def test_bounding_boxes(box_a, box_b, disk):
+    assert np.array_equal((box_a & disk).bounding_box().bounds, [[1, 2], [1, 2]])
+    assert np.array_equal((box_b | disk).bounding_box().bounds, [[1, 3], [-1, 3]])
+
+
+@pytest.mark.parametrize("n", [1, 1000])
+def test_rand(box_a, box_b, disk, n):
+    window = (box_a | box_b) - disk
+    points = window.rand(n, rng=3)
+    assert points.shape == (n, 2)
+    assert np.all(window.indicator_function(points))
+
+
+def test_rand_raises_on_empty_window(box_a):
+    with pytest.raises(Exception):
+        (box_a - box_a).rand(10, rng=4, max_batch_size=1000)
+
+
+def test_union_with_empty_operand(box_a):
+    disjoint = BallWindow(np.array([0, 0]), 1) & BallWindow(np.array([5, 0]), 1)
+    assert isinstance(disjoint.bounding_box(), EmptyWindow)
+    for window in (disjoint | box_a, box_a | disjoint):
+        assert window.bounding_box() == box_a
+        assert window.volume() == 4
+        points = window.rand(100, rng=5)
+        assert np.all(box_a.indicator_function(points))
+    assert isinstance((disjoint | disjoint).bounding_box(), EmptyWindow)
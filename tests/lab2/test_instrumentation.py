@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import pytest
+
+from sdia_python.lab2 import instrumentation
+from sdia_python.lab2.ball_window import BallWindow, UnitBallWindow
+from sdia_python.lab2.box_window import BoxWindow
+
+
+@pytest.fixture
+def box():
+    return BoxWindow(np.array([[0, 2], [0, 3]]))
+
+
+def test_disabled_instrumentation_leaves_methods_untouched():
+    rand = BoxWindow.rand
+    with instrumentation.collect():
+        assert BoxWindow.rand is not rand
+    assert BoxWindow.rand is rand
+    assert not instrumentation.is_enabled()
+
+
+def test_collect_records_calls(box):
+    with instrumentation.collect() as collector:
+        points = box.rand(100, rng=0)
+        box.rand(50, rng=1)
+        box.indicator_function(points)
+        assert [1, 1] in box
+        box.volume()
+    snapshot = collector.snapshot()
+    assert snapshot["BoxWindow.rand"]["calls"] == 2
+    assert snapshot["BoxWindow.rand"]["points"] == 150
+    assert snapshot["BoxWindow.rand"]["bytes"] == 150 * 2 * 8
+    # __contains__ calls indicator_function on the single point
+    assert snapshot["BoxWindow.indicator_function"]["calls"] == 2
+    assert snapshot["BoxWindow.indicator_function"]["points"] == 101
+    assert snapshot["BoxWindow.__contains__"]["calls"] == 1
+    assert snapshot["BoxWindow.volume"]["points"] == 0
+    stats = snapshot["BoxWindow.rand"]
+    assert 0 <= stats["p50"] <= stats["p90"] <= stats["p99"] <= stats["total_time"]
+
+
+def test_calls_outside_collect_are_not_recorded(box):
+    with instrumentation.collect() as collector:
+        box.rand(10, rng=0)
+    box.rand(10, rng=0)
+    assert collector.snapshot()["BoxWindow.rand"]["calls"] == 1
+
+
+def test_stats_per_window_class():
+    with instrumentation.collect() as collector:
+        BallWindow(np.array([0, 0]), 2).rand(10, rng=0)
+        UnitBallWindow(np.array([0, 0])).rand(20, rng=0)
+    snapshot = collector.snapshot()
+    assert snapshot["BallWindow.rand"]["points"] == 10
+    assert snapshot["UnitBallWindow.rand"]["points"] == 20
+
+
+def test_nested_collect(box):
+    with instrumentation.collect() as outer:
+        box.rand(10, rng=0)
+        with instrumentation.collect() as inner:
+            box.rand(10, rng=0)
+        box.rand(10, rng=0)
+        assert instrumentation.get_collector() is outer
+    assert outer.snapshot()["BoxWindow.rand"]["calls"] == 2
+    assert inner.snapshot()["BoxWindow.rand"]["calls"] == 1
+
+
+def test_snapshot_to_json(box):
+    with instrumentation.collect() as collector:
+        box.rand(10, rng=0)
+    assert json.loads(collector.to_json()) == collector.snapshot()
+    collector.reset()
+    assert collector.snapshot() == {}
+
+
+def test_latency_histogram_has_bounded_size_and_accurate_percentiles():
+    collector = instrumentation.Collector()
+    latencies = np.random.default_rng(0).lognormal(-8, 1, size=10 ** 5)
+    for elapsed in latencies:
+        collector.record("BoxWindow.rand", elapsed, None)
+    stats = collector.stats["BoxWindow.rand"]
+    assert len(stats["buckets"]) == instrumentation.N_BUCKETS
+    snapshot = collector.snapshot()["BoxWindow.rand"]
+    assert snapshot["calls"] == 10 ** 5
+    assert snapshot["total_time"] == pytest.approx(latencies.sum())
+    assert snapshot["max_time"] == latencies.max()
+    for q in instrumentation.PERCENTILES:
+        expected = np.percentile(latencies, q)
+        assert snapshot[f"p{q}"] == pytest.approx(expected, rel=0.1)
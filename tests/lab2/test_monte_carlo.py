@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.monte_carlo import estimate_volume, integrate
+
+
+@pytest.fixture
+def unit_disk():
+    return BallWindow(np.array([0, 0]), 1)
+
+
+@pytest.fixture
+def box_2d_11():
+    return BoxWindow(np.array([[-1, 1], [-1, 1]]))
+
+
+def test_estimate_volume_uses_whole_budget_without_stopping_criterion(
+    unit_disk, box_2d_11
+):
+    volume, std_error, n = estimate_volume(
+        unit_disk, box_2d_11, n_max=25000, chunk_size=10000, rng=0
+    )
+    assert n == 25000
+    assert volume == pytest.approx(np.pi, abs=5 * std_error)
+
+
+def test_estimate_volume_stops_on_relative_error(unit_disk, box_2d_11):
+    volume, std_error, n = estimate_volume(
+        unit_disk, box_2d_11, n_max=10 ** 7, chunk_size=1000, rel_tol=0.01, rng=1
+    )
+    assert n < 10 ** 7
+    assert std_error <= 0.01 * volume
+    assert volume == pytest.approx(np.pi, rel=0.05)
+
+
+def test_estimate_volume_stops_on_confidence_interval_width(unit_disk, box_2d_11):
+    volume, std_error, n = estimate_volume(
+        unit_disk, box_2d_11, n_max=10 ** 7, chunk_size=1000, ci_width=0.1, rng=2
+    )
+    assert n < 10 ** 7
+    assert 2 * 1.96 * std_error <= 0.1
+
+
+def test_estimate_volume_is_reproducible(unit_disk, box_2d_11):
+    assert estimate_volume(unit_disk, box_2d_11, n_max=5000, rng=3) == estimate_volume(
+        unit_disk, box_2d_11, n_max=5000, rng=3
+    )
+
+
+def test_estimate_volume_of_the_bounding_box_itself(box_2d_11):
+    volume, std_error, n = estimate_volume(
+        box_2d_11, box_2d_11, n_max=3000, chunk_size=1000, rel_tol=0.1, rng=4
+    )
+    assert (volume, std_error, n) == (4, 0, 3000)
+
+
+def exp_sum(points):
+    return np.exp(points.sum(axis=1))
+
+
+UNIT_SQUARE = BoxWindow(np.array([[0, 1], [0, 1]]))
+EXP_SUM_INTEGRAL = (np.e - 1) ** 2
+# variance of exp(X + Y) for X, Y uniform on [0, 1]
+EXP_SUM_VARIANCE = ((np.e ** 2 - 1) / 2) ** 2 - EXP_SUM_INTEGRAL ** 2
+
+
+def test_integrate_plain_monte_carlo():
+    estimate, variance = integrate(exp_sum, UNIT_SQUARE, 10 ** 4, rng=0)
+    assert variance == pytest.approx(EXP_SUM_VARIANCE / 10 ** 4, rel=0.2)
+    assert abs(estimate - EXP_SUM_INTEGRAL) < 4 * np.sqrt(variance)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"strata": 10},
+        {"strata": (4, 25), "allocation": np.arange(1, 101).reshape(4, 25)},
+        {"antithetic": True},
+        {"control_variate": (lambda x: 1 + x.sum(axis=1), 2)},
+        {"strata": 5, "antithetic": True, "batch_size": 999},
+    ],
+)
+def test_integrate_variance_reduction(options):
+    estimate, variance = integrate(exp_sum, UNIT_SQUARE, 10 ** 4, rng=1, **options)
+    assert variance < EXP_SUM_VARIANCE / 10 ** 4 / 5
+    assert abs(estimate - EXP_SUM_INTEGRAL) < 4 * np.sqrt(variance)
+
+
+def test_integrate_stratified_reduces_variance_tenfold():
+    estimates = [
+        integrate(exp_sum, UNIT_SQUARE, 10 ** 3, strata=10, rng=seed)[0]
+        for seed in range(200)
+    ]
+    assert np.var(estimates) < EXP_SUM_VARIANCE / 10 ** 3 / 10
+
+
+def test_integrate_over_ball():
+    ball = BallWindow(np.array([1, 1]), 1)
+    estimate, variance = integrate(
+        lambda x: np.ones(len(x)), ball, 10 ** 5, strata=4, rng=2
+    )
+    assert abs(estimate - np.pi) < 4 * np.sqrt(variance)
+
+
+def test_raise_Exception_when_too_few_points_per_stratum():
+    with pytest.raises(Exception):
+        integrate(exp_sum, UNIT_SQUARE, 100, strata=10)
+
+
+def test_integrate_does_not_depend_on_batch_size():
+    options = {"strata": (3, 7), "allocation": np.arange(1, 22).reshape(3, 7)}
+    small = integrate(exp_sum, UNIT_SQUARE, 2000, batch_size=17, rng=3, **options)
+    large = integrate(exp_sum, UNIT_SQUARE, 2000, batch_size=10 ** 5, rng=3, **options)
+    # the same points are drawn, only the moments are merged differently
+    assert small == pytest.approx(large, rel=1e-9)
@@ -0,0 +1,69 @@
+import gc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.parallel import parallel_estimate_volume, parallel_rand
+from sdia_python.lab2.utils import spawn_seed_sequences
+
+
+def test_spawn_seed_sequences_are_reproducible_and_independent():
+    first = [np.random.default_rng(s).random() for s in spawn_seed_sequences(0, 3)]
+    second = [np.random.default_rng(s).random() for s in spawn_seed_sequences(0, 3)]
+    assert first == second
+    assert len(set(first)) == 3
+
+
+@pytest.mark.parametrize(
+    "window",
+    [
+        BoxWindow(np.array([[1, 2], [10, 15.5], [3.5, 7]])),
+        BallWindow(np.array([1, 2, 3]), 5),
+    ],
+)
+def test_parallel_rand(window):
+    points = parallel_rand(window, 1001, seed=0, n_workers=3)
+    assert points.shape == (1001, 3)
+    assert np.all(window.indicator_function(points))
+    assert np.array_equal(points, parallel_rand(window, 1001, seed=0, n_workers=3))
+
+
+def test_parallel_estimate_volume():
+    ball = BallWindow(np.array([0, 0]), 1)
+    box = BoxWindow(np.array([[-1, 1], [-1, 1]]))
+    result = parallel_estimate_volume(ball, box, n=40000, seed=0, n_workers=2)
+    volume, std_error, n = result
+    assert n == 40000
+    assert volume == pytest.approx(np.pi, abs=5 * std_error)
+    assert result == parallel_estimate_volume(ball, box, n=40000, seed=0, n_workers=2)
+
+
+def test_parallel_rand_reuses_executor():
+    box = BoxWindow(np.array([[0, 1], [0, 2]]))
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        first = parallel_rand(box, 500, seed=1, n_workers=4, executor=executor)
+        second = parallel_rand(box, 500, seed=1, n_workers=4, executor=executor)
+    assert np.array_equal(first, second)
+    assert np.array_equal(first, parallel_rand(box, 500, seed=1, n_workers=4))
+
+
+def test_parallel_rand_shared_memory_outlives_views():
+    box = BoxWindow(np.array([[0, 1], [0, 2]]))
+    points = parallel_rand(box, 100, seed=2, n_workers=2)
+    expected = points.copy()
+    view = points[10:20]
+    del points
+    gc.collect()
+    assert np.array_equal(view, expected[10:20])
+    view[:] = 0
+    assert not np.any(view)
+
+
+def test_spawn_seed_sequences_from_generator():
+    rng = np.random.default_rng(3)
+    children = spawn_seed_sequences(rng, 2)
+    assert [c.entropy for c in children] == [3, 3]
+    assert children[0].spawn_key != children[1].spawn_key
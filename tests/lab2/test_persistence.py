@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from sdia_python.lab2.ball_window import BallWindow, UnitBallWindow
+from sdia_python.lab2.box_window import BoxWindow, UnitBoxWindow
+from sdia_python.lab2.persistence import WindowStore, load, save
+from sdia_python.lab2.point_process import binomial_process
+
+windows = [
+    BoxWindow(np.array([[0, 2], [0, 3]])),
+    BallWindow(np.array([1.5, -2, 0.25]), 2.5),
+    UnitBoxWindow(np.array([0.1, 0.2, 0.3])),
+    UnitBallWindow(np.array([1, 2])),
+    BoxWindow(np.array([[-1.5, 1e-3]])),
+]
+
+
+def test_round_trip_windows(tmp_path):
+    filename = tmp_path / "windows.bin"
+    save(filename, windows)
+    loaded, samples = load(filename)
+    assert samples is None
+    assert loaded == windows
+    assert [type(w) for w in loaded] == [type(w) for w in windows]
+    for window, expected in zip(loaded, windows):
+        assert window.volume() == expected.volume()
+
+
+def test_round_trip_samples(tmp_path):
+    filename = tmp_path / "samples.bin"
+    patterns = binomial_process(windows[0], 10, n_realizations=5, rng=0)
+    save(filename, windows[:1], samples=patterns)
+    loaded, samples = load(filename)
+    assert loaded == windows[:1]
+    assert np.array_equal(samples.points, patterns.points)
+    assert np.array_equal(samples.offsets, patterns.offsets)
+    # the points are a read-only view of the memory-mapped file
+    assert not samples.points.flags.owndata
+    assert not samples.points.flags.writeable
+
+
+def test_save_single_sample_set(tmp_path):
+    filename = tmp_path / "samples.bin"
+    points = np.random.default_rng(0).random((7, 3)).astype(np.float32)
+    save(filename, samples=points)
+    loaded, samples = load(filename)
+    assert loaded == []
+    assert len(samples) == 1
+    assert samples[0].dtype == np.float32
+    assert np.array_equal(samples[0], points)
+
+
+def test_window_store_builds_windows_on_access(tmp_path):
+    filename = tmp_path / "windows.bin"
+    save(filename, windows)
+    store = WindowStore(filename)
+    assert len(store) == len(windows)
+    assert store[3] == windows[3]
+    assert store[-1] == windows[-1]
+    assert store[1:3] == windows[1:3]
+    with pytest.raises(IndexError):
+        store[len(windows)]
+
+
+def test_raise_Exception_when_saving_unsupported_window(tmp_path):
+    with pytest.raises(Exception):
+        save(tmp_path / "windows.bin", [windows[0] | windows[1]])
+
+
+def test_raise_Exception_when_loading_other_file(tmp_path):
+    filename = tmp_path / "other.bin"
+    filename.write_bytes(b"not a window file")
+    with pytest.raises(Exception):
+        WindowStore(filename)
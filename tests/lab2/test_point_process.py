@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.point_process import (
+    PointPatterns,
+    binomial_process,
+    poisson_process,
+)
+
+
+@pytest.fixture(
+    params=[BoxWindow(np.array([[0, 2], [0, 3]])), BallWindow(np.array([1, 1]), 2)]
+)
+def window(request):
+    return request.param
+
+
+def test_raise_Exception_when_offsets_do_not_match():
+    with pytest.raises(Exception):
+        PointPatterns(np.zeros((5, 2)), np.array([0, 2, 4]))
+
+
+def test_point_patterns_indexing():
+    points = np.arange(10).reshape(5, 2)
+    patterns = PointPatterns(points, np.array([0, 2, 2, 5]))
+    assert len(patterns) == 3
+    assert np.array_equal(patterns[0], points[:2])
+    assert len(patterns[1]) == 0
+    assert np.array_equal(patterns[-1], points[2:])
+    assert np.array_equal(patterns.counts(), [2, 0, 3])
+    assert np.array_equal(patterns.labels(), [0, 0, 2, 2, 2])
+
+
+def test_binomial_process(window):
+    patterns = binomial_process(window, 7, n_realizations=100, rng=0)
+    assert len(patterns) == 100
+    assert np.all(patterns.counts() == 7)
+    assert np.all(window.indicator_function(patterns.points))
+
+
+def test_homogeneous_poisson_process(window):
+    patterns = poisson_process(window, 5, n_realizations=2000, rng=1)
+    counts = patterns.counts()
+    expected = 5 * window.volume()
+    assert counts.mean() == pytest.approx(expected, rel=0.05)
+    assert counts.var() == pytest.approx(expected, rel=0.1)
+    assert np.all(window.indicator_function(patterns.points))
+
+
+def test_inhomogeneous_poisson_process():
+    box = BoxWindow(np.array([[0, 1], [0, 1]]))
+
+    def intensity(points):
+        return 100 * points[:, 0]
+
+    patterns = poisson_process(box, intensity, 1000, rng=2, max_intensity=100)
+    # the integral of the intensity over the box is 50
+    assert patterns.counts().mean() == pytest.approx(50, rel=0.05)
+    assert patterns.points[:, 0].mean() == pytest.approx(2 / 3, rel=0.02)
+    assert np.all(patterns.labels() == np.repeat(range(1000), patterns.counts()))
+
+
+def test_raise_Exception_when_intensity_exceeds_max_intensity():
+    box = BoxWindow(np.array([[0, 1], [0, 1]]))
+    with pytest.raises(Exception):
+        poisson_process(box, lambda x: 100 * x[:, 0], 10, rng=3, max_intensity=10)
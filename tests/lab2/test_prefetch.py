@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.prefetch import PrefetchSampler
+from sdia_python.lab2.utils import get_random_number_generator, spawn_seed_sequences
+
+
+@pytest.fixture(
+    params=[BoxWindow(np.array([[0, 2], [0, 3]])), BallWindow(np.array([1, 1]), 2)]
+)
+def window(request):
+    return request.param
+
+
+def test_prefetch_rand_points_are_in_window(window):
+    with PrefetchSampler(window, chunk_size=100, n_workers=2, seed=0) as sampler:
+        for n in (1, 50, 100, 250):
+            points = sampler.rand(n)
+            assert points.shape == (n, 2)
+            assert np.all(window.indicator_function(points))
+
+
+def test_prefetch_single_worker_is_reproducible(window):
+    with PrefetchSampler(window, chunk_size=30, n_workers=1, seed=1) as sampler:
+        points = np.concatenate([sampler.rand(n) for n in (7, 40, 1, 52)])
+    rng = get_random_number_generator(spawn_seed_sequences(1, 1)[0])
+    expected = np.concatenate([window.rand(30, rng=rng) for _ in range(4)])
+    assert np.array_equal(points, expected[:100])
+
+
+def test_prefetch_statistics(window):
+    with PrefetchSampler(window, chunk_size=10, n_workers=2, seed=2) as sampler:
+        sampler.rand(5)
+        sampler.rand(25)
+        stats = sampler.statistics()
+    assert stats["requests"] == 2
+    assert stats["points"] == 30
+    assert stats["chunks"] == 3
+    assert 0 <= stats["starvations"] <= stats["chunks"]
+    assert stats["wait_time"] >= 0
+
+
+def test_close_stops_workers(window):
+    sampler = PrefetchSampler(window, chunk_size=10, n_workers=3, max_chunks=1)
+    sampler.rand(1)
+    threads = sampler._threads
+    sampler.close()
+    assert not any(thread.is_alive() for thread in threads)
+    with pytest.raises(Exception):
+        sampler.rand(1)
+
+
+def test_worker_exception_is_raised_by_rand():
+    class FailingWindow:
+        def dimension(self):
+            return 2
+
+        def rand(self, n, rng=None):
+            raise ValueError("cannot sample")
+
+    with PrefetchSampler(FailingWindow(), n_workers=1) as sampler:
+        with pytest.raises(ValueError):
+            sampler.rand(1)
+        # the worker has stopped, the error is raised again instead of blocking
+        with pytest.raises(ValueError):
+            sampler.rand(1)
+
+
+def test_rand_raises_when_workers_are_dead(window):
+    sampler = PrefetchSampler(window, chunk_size=10, n_workers=1, max_chunks=1)
+    sampler._stop.set()
+    for thread in sampler._threads:
+        thread.join()
+    sampler._stop.clear()
+    while not sampler._queue.empty():
+        sampler._queue.get()
+    with pytest.raises(Exception):
+        sampler.rand(100)
+    sampler.close()
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.monte_carlo import estimate_volume, estimate_volume_rqmc
+from sdia_python.lab2.qmc import METHODS, sample_unit_cube, unit_cube_to_ball
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_sample_unit_cube(method):
+    u = sample_unit_cube(256, 3, method=method, rng=0)
+    assert u.shape == (256, 3)
+    assert np.all((0 <= u) & (u <= 1))
+    assert np.array_equal(u, sample_unit_cube(256, 3, method=method, rng=0))
+
+
+def test_raise_Exception_when_method_is_unknown():
+    with pytest.raises(Exception):
+        sample_unit_cube(16, 2, method="grid")
+
+
+def test_unit_cube_to_ball_center_of_the_cube():
+    points = unit_cube_to_ball(np.array([[0.5, 0.5, 0.25]]))
+    assert np.allclose(np.linalg.norm(points), 0.25 ** 0.5)
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_box_rand_method(method):
+    box = BoxWindow(np.array([[1, 2], [10, 15.5], [3.5, 7]]))
+    points = box.rand(256, rng=1, method=method)
+    assert points.shape == (256, 3)
+    assert np.all(box.indicator_function(points))
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("d", [1, 2, 5])
+def test_ball_rand_method_is_uniform(method, d):
+    ball = BallWindow(np.full(d, 1.0), 2)
+    points = ball.rand(2 ** 14, rng=2, method=method)
+    assert points.shape == (2 ** 14, d)
+    assert np.all(ball.indicator_function(points))
+    inner = BallWindow(np.full(d, 1.0), 1)
+    assert np.mean(inner.indicator_function(points)) == pytest.approx(
+        0.5 ** d, abs=0.01
+    )
+
+
+def test_rqmc_volume_has_smaller_error_than_monte_carlo():
+    disk = BallWindow(np.array([0, 0]), 1)
+    box = BoxWindow(np.array([[-1, 1], [-1, 1]]))
+    volume, std_error, n = estimate_volume_rqmc(disk, box, n=2 ** 12, rng=3)
+    assert n == 16 * 2 ** 12
+    assert volume == pytest.approx(np.pi, abs=5 * std_error)
+    _, mc_std_error, _ = estimate_volume(disk, box, n_max=n, rng=3)
+    assert std_error < mc_std_error
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.rasterize import grid_nodes, rasterize
+
+BOUNDS = np.array([[0, 4], [-1, 2], [0, 1]])
+SHAPE = (40, 30, 7)
+
+windows = [
+    BoxWindow(np.array([[0.5, 2.05], [-0.3, 1.2], [0, 1]])),
+    BallWindow(np.array([2, 0.5, 0.5]), 1.2),
+    BallWindow(np.array([3.9, 1.9, 0.9]), 0.5),
+    BoxWindow(np.array([[5, 6], [0, 1], [0, 1]])),
+    BallWindow(np.array([1, 0, 0.5]), 1)
+    - BoxWindow(np.array([[0, 1], [-1, 0], [0, 1]])),
+]
+
+
+def expected_counts(windows, bounds, shape):
+    mesh = np.meshgrid(*grid_nodes(bounds, shape), indexing="ij")
+    points = np.stack(mesh, axis=-1).reshape(-1, len(shape))
+    counts = sum(w.indicator_function(points).astype(int) for w in windows)
+    return counts.reshape(shape)
+
+
+def test_grid_nodes():
+    x, y = grid_nodes(np.array([[0, 1], [-1, 1]]), (2, 4))
+    assert np.allclose(x, [0.25, 0.75])
+    assert np.allclose(y, [-0.75, -0.25, 0.25, 0.75])
+
+
+@pytest.mark.parametrize("slab_size", [None, 1, 7])
+def test_rasterize_occupancy(slab_size):
+    grid = rasterize(windows, BOUNDS, SHAPE, slab_size=slab_size)
+    assert grid.dtype == bool
+    assert grid.shape == SHAPE
+    assert np.array_equal(grid, expected_counts(windows, BOUNDS, SHAPE) > 0)
+
+
+@pytest.mark.parametrize("slab_size", [None, 3])
+def test_rasterize_counts(slab_size):
+    grid = rasterize(windows, BOUNDS, SHAPE, counts=True, slab_size=slab_size)
+    assert grid.dtype == np.uint16
+    expected = expected_counts(windows, BOUNDS, SHAPE)
+    assert expected.max() > 1
+    assert np.array_equal(grid, expected)
+
+
+def test_rasterize_to_memmap(tmp_path):
+    filename = tmp_path / "grid.npy"
+    grid = rasterize(windows, BOUNDS, SHAPE, dtype=np.uint8, filename=filename)
+    assert isinstance(grid, np.memmap)
+    loaded = np.load(filename)
+    assert loaded.dtype == np.uint8
+    assert np.array_equal(loaded, expected_counts(windows, BOUNDS, SHAPE) > 0)
+
+
+def test_rasterize_without_windows():
+    assert not np.any(rasterize([], BOUNDS, SHAPE))
+
+
+def test_rasterize_counts_do_not_wrap():
+    balls = [BallWindow(np.array([2, 0.5, 0.5]), 1)] * 300
+    grid = rasterize(balls, BOUNDS, SHAPE, counts=True)
+    assert grid.max() == 300
+    with pytest.raises(Exception):
+        rasterize(balls, BOUNDS, SHAPE, counts=True, dtype=np.uint8)
+    assert rasterize(balls, BOUNDS, SHAPE, counts=True, dtype=float).max() == 300
+
+
+@pytest.mark.parametrize("dtype", [bool, np.bool_, object])
+def test_rasterize_counts_raise_with_non_numeric_dtype(dtype):
+    balls = [BallWindow(np.array([2, 0.5, 0.5]), 1)] * 3
+    with pytest.raises(Exception):
+        rasterize(balls, BOUNDS, SHAPE, counts=True, dtype=dtype)
+
+
+def test_rasterize_skips_empty_windows():
+    empty = BallWindow(np.array([0, 0, 0]), 1) & BallWindow(np.array([5, 0, 0]), 1)
+    grid = rasterize([empty, windows[0], empty & windows[1]], BOUNDS, SHAPE)
+    assert np.array_equal(grid, expected_counts(windows[:1], BOUNDS, SHAPE) > 0)
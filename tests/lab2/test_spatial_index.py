@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.spatial_index import GridIndex
+
+
+@pytest.fixture
+def windows():
+    rng = np.random.default_rng(0)
+    boxes = [
+        BoxWindow(np.stack([a, a + w], axis=1))
+        for a, w in zip(rng.uniform(-5, 5, (30, 2)), rng.uniform(0, 3, (30, 2)))
+    ]
+    balls = [
+        BallWindow(c, r)
+        for c, r in zip(rng.uniform(-5, 5, (30, 2)), rng.uniform(0, 2, 30))
+    ]
+    return boxes + balls
+
+
+def brute_force(windows, point):
+    return [i for i, w in enumerate(windows) if point in w]
+
+
+def test_query_points_agrees_with_contains(windows):
+    index = GridIndex(cell_size=1.5)
+    for window in windows:
+        index.insert(window)
+    points = np.random.default_rng(1).uniform(-7, 7, size=(500, 2))
+    hits = index.query_points(points)
+    assert hits == [brute_force(windows, p) for p in points]
+
+
+def test_query_points_on_closed_boundaries():
+    index = GridIndex(cell_size=1)
+    box_id = index.insert(BoxWindow(np.array([[0, 1], [0, 1]])))
+    ball_id = index.insert(BallWindow(np.array([3, 0]), 2))
+    points = np.array([[1, 1], [0, 0], [1, 0], [5, 0], [1.0000001, 0]])
+    expected = [[box_id], [box_id], [box_id, ball_id], [ball_id], [ball_id]]
+    assert index.query_points(points) == expected
+
+
+def test_delete(windows):
+    index = GridIndex(cell_size=1)
+    ids = [index.insert(window) for window in windows]
+    for i in ids[::2]:
+        index.delete(i)
+    assert len(index) == len(windows) // 2
+    points = np.random.default_rng(2).uniform(-7, 7, size=(200, 2))
+    hits = index.query_points(points)
+    assert hits == [[i for i in brute_force(windows, p) if i % 2] for p in points]
+
+
+@pytest.mark.parametrize("cell_size", [0.5, 100])
+def test_query_box(windows, cell_size):
+    index = GridIndex(cell_size=cell_size)
+    for window in windows:
+        index.insert(window)
+    box = BoxWindow(np.array([[-1, 2], [0, 0.5]]))
+    box_points = np.concatenate([box.rand(20000, rng=3), box.bounds.T])
+    expected = [
+        i for i, w in enumerate(windows) if np.any(w.indicator_function(box_points))
+    ]
+    result = index.query_box(box)
+    assert set(expected) <= set(result)
+    assert result == sorted(result)
+
+
+def test_query_box_exact_overlap():
+    index = GridIndex(cell_size=1)
+    ball_id = index.insert(BallWindow(np.array([0, 0]), 1))
+    box_id = index.insert(BoxWindow(np.array([[2, 3], [2, 3]])))
+    assert index.query_box(BoxWindow(np.array([[0.8, 2], [0.8, 2]]))) == [box_id]
+    assert index.query_box(BoxWindow(np.array([[0.6, 2], [0.6, 2]]))) == [
+        ball_id,
+        box_id,
+    ]
+    assert index.query_box(BoxWindow(np.array([[1, 1.5], [-1, 1]]))) == [ball_id]
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.spatial_statistics import (
+    _pair_counts,
+    pair_correlation,
+    ripley_k,
+)
+
+RADII = np.array([0.02, 0.05, 0.1, 0.15])
+
+
+@pytest.fixture
+def box():
+    return BoxWindow(np.array([[0, 1], [0, 1]]))
+
+
+@pytest.fixture
+def ball():
+    return BallWindow(np.array([0.5, 0.5]), 0.5)
+
+
+def brute_force_ripley_k(points, box, radii):
+    diff = points[:, None, :] - points[None, :, :]
+    distances = np.linalg.norm(diff, axis=2)
+    weights = box.volume() / np.prod(box.widths() - np.abs(diff), axis=2)
+    np.fill_diagonal(distances, np.inf)
+    n = len(points)
+    return np.array(
+        [box.volume() / (n * (n - 1)) * weights[distances <= r].sum() for r in radii]
+    )
+
+
+def test_ripley_k_matches_brute_force(box):
+    points = box.rand(300, rng=0)
+    expected = brute_force_ripley_k(points, box, RADII)
+    assert np.allclose(ripley_k(points, box, RADII), expected)
+
+
+@pytest.mark.parametrize("window", ["box", "ball"])
+def test_ripley_k_of_uniform_points(window, request):
+    window = request.getfixturevalue(window)
+    points = window.rand(5000, rng=1)
+    assert np.allclose(ripley_k(points, window, RADII), np.pi * RADII ** 2, rtol=0.05)
+
+
+def test_edge_correction_reduces_bias(ball):
+    points = ball.rand(5000, rng=2)
+    corrected = ripley_k(points, ball, RADII)
+    uncorrected = ripley_k(points, ball, RADII, correction="none")
+    assert np.all(uncorrected < corrected)
+
+
+@pytest.mark.parametrize("window", ["box", "ball"])
+def test_pair_correlation_of_uniform_points(window, request):
+    window = request.getfixturevalue(window)
+    points = window.rand(5000, rng=3)
+    centers, g = pair_correlation(points, window, np.linspace(0.02, 0.15, 6))
+    assert np.allclose(centers, np.linspace(0.02, 0.15, 6)[:-1] + 0.013)
+    assert np.allclose(g, 1, atol=0.1)
+
+
+def test_ripley_k_isotropic_one_dimension():
+    ball = BallWindow(np.zeros(1), 1.0)
+    points = ball.rand(400, rng=7)
+    radii = np.array([0.1, 0.5])
+    x = points[:, 0]
+    distances = np.abs(x[:, None] - x[None, :])
+    # number of the points x - r and x + r lying in [-1, 1]
+    inside = (np.abs(x[:, None] - distances) <= 1).astype(int) + (
+        np.abs(x[:, None] + distances) <= 1
+    )
+    weights = 2 / inside
+    np.fill_diagonal(distances, np.inf)
+    expected = np.array(
+        [2 / (400 * 399) * weights[distances <= r].sum() for r in radii]
+    )
+    k = ripley_k(points, ball, radii)
+    assert np.allclose(k, expected)
+    # K(r) = 2r for a Poisson process on the line
+    assert np.allclose(k, 2 * radii, rtol=0.1)
+
+
+def test_raise_Exception_when_correction_does_not_match_window(ball):
+    with pytest.raises(Exception):
+        ripley_k(ball.rand(10, rng=4), ball, RADII, correction="translation")
+
+
+@pytest.mark.parametrize(
+    "window, correction",
+    [("box", "translation"), ("ball", "isotropic"), ("box", "none")],
+)
+def test_pair_counts_do_not_depend_on_chunks(window, correction, request):
+    window = request.getfixturevalue(window)
+    points = window.rand(500, rng=5)
+    radii = np.asarray(RADII, dtype=float)
+    expected = _pair_counts(points, window, radii, correction)
+    chunked = _pair_counts(points, window, radii, correction, max_pairs=10)
+    assert np.allclose(chunked, expected)
+
+
+def test_ripley_k_without_correction_matches_brute_force(box):
+    points = box.rand(300, rng=6)
+    distances = np.linalg.norm(points[:, None, :] - points[None, :, :], axis=2)
+    np.fill_diagonal(distances, np.inf)
+    counts = np.array([np.count_nonzero(distances <= r) for r in RADII])
+    expected = box.volume() / (300 * 299) * counts
+    assert np.allclose(ripley_k(points, box, RADII, correction="none"), expected)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.streaming import iter_rand, write_rand
+
+
+@pytest.fixture(
+    params=[
+        BoxWindow(np.array([[1, 2], [10, 15.5], [3.5, 7]])),
+        BallWindow(np.array([1, 2, 3]), 5),
+    ]
+)
+def window(request):
+    return request.param
+
+
+def test_iter_rand_chunks(window):
+    chunks = list(iter_rand(window, 1050, chunk_size=100, seed=0))
+    assert [len(chunk) for chunk in chunks] == [100] * 10 + [50]
+    assert all(np.all(window.indicator_function(chunk)) for chunk in chunks)
+
+
+def test_iter_rand_resumes_from_any_chunk(window):
+    chunks = list(iter_rand(window, 1050, chunk_size=100, seed=0))
+    resumed = list(iter_rand(window, 1050, chunk_size=100, seed=0, start_chunk=7))
+    assert len(resumed) == 4
+    assert all(np.array_equal(a, b) for a, b in zip(chunks[7:], resumed))
+
+
+def test_write_rand(window, tmp_path):
+    filename = tmp_path / "points.npy"
+    write_rand(window, filename, 1050, chunk_size=100, seed=1)
+    points = np.load(filename, mmap_mode="r")
+    assert isinstance(points, np.memmap)
+    assert points.shape == (1050, 3)
+    expected = np.concatenate(list(iter_rand(window, 1050, chunk_size=100, seed=1)))
+    assert np.array_equal(points, expected)
+
+
+def test_write_rand_resumes(window, tmp_path):
+    filename = tmp_path / "points.npy"
+    full = write_rand(window, tmp_path / "full.npy", 1050, chunk_size=100, seed=2)
+    partial = write_rand(window, filename, 1050, chunk_size=100, seed=2)
+    partial[500:] = 0
+    partial.flush()
+    write_rand(window, filename, 1050, chunk_size=100, seed=2, start_chunk=5)
+    assert np.array_equal(np.load(filename, mmap_mode="r"), full)
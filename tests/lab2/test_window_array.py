@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from sdia_python.lab2.ball_window import BallWindow
+from sdia_python.lab2.box_window import BoxWindow
+from sdia_python.lab2.window_array import BallWindowArray, BoxWindowArray
+
+
+@pytest.fixture
+def boxes():
+    rng = np.random.default_rng(0)
+    lower = rng.uniform(-5, 5, size=(20, 2))
+    widths = rng.uniform(0, 3, size=(20, 2))
+    return [BoxWindow(np.stack([a, a + w], axis=1)) for a, w in zip(lower, widths)]
+
+
+@pytest.fixture
+def balls():
+    rng = np.random.default_rng(1)
+    centers = rng.uniform(-5, 5, size=(20, 2))
+    return [BallWindow(c, r) for c, r in zip(centers, rng.uniform(0, 3, size=20))]
+
+
+@pytest.fixture
+def points():
+    return np.random.default_rng(2).uniform(-7, 7, size=(300, 2))
+
+
+def test_raise_Exception_when_box_bounds_are_incorrect():
+    with pytest.raises(Exception):
+        BoxWindowArray(np.array([[[2, 1], [3, 4]]]))
+
+
+def test_raise_Exception_when_radius_is_negative():
+    with pytest.raises(Exception):
+        BallWindowArray(np.zeros((2, 3)), np.array([1, -1]))
+
+
+@pytest.mark.parametrize(
+    "array_class, windows", [(BoxWindowArray, "boxes"), (BallWindowArray, "balls")]
+)
+def test_vectorized_methods_match_windows(array_class, windows, points, request):
+    windows = request.getfixturevalue(windows)
+    array = array_class.from_windows(windows)
+    assert len(array) == 20
+    assert array.dimension() == 2
+    assert np.allclose(array.volume(), [w.volume() for w in windows])
+    expected_mask = np.array([w.indicator_function(points) for w in windows])
+    assert np.array_equal(array.contains(points, chunk_size=64), expected_mask)
+
+
+@pytest.mark.parametrize(
+    "array_class, windows", [(BoxWindowArray, "boxes"), (BallWindowArray, "balls")]
+)
+def test_sparse_contains(array_class, windows, points, request):
+    array = array_class.from_windows(request.getfixturevalue(windows))
+    window_ids, point_ids = array.contains(points, sparse=True, chunk_size=64)
+    mask = np.zeros((len(array), len(points)), dtype=bool)
+    mask[window_ids, point_ids] = True
+    assert np.array_equal(mask, array.contains(points))
+
+
+def test_box_center_and_round_trip(boxes):
+    array = BoxWindowArray.from_windows(boxes)
+    assert np.allclose(array.center(), [b.center() for b in boxes])
+    for box, other in zip(boxes, array.to_windows()):
+        assert np.array_equal(box.bounds, other.bounds)
+
+
+def test_ball_center_and_round_trip(balls):
+    array = BallWindowArray.from_windows(balls)
+    assert np.array_equal(array.center(), [b.center for b in balls])
+    for ball, other in zip(balls, array.to_windows()):
+        assert np.array_equal(ball.center, other.center)
+        assert ball.radius == other.radius
+
+
+@pytest.mark.parametrize(
+    "array_class, windows", [(BoxWindowArray, "boxes"), (BallWindowArray, "balls")]
+)
+def test_rand(array_class, windows, request):
+    windows = request.getfixturevalue(windows)
+    points = array_class.from_windows(windows).rand(50, rng=3)
+    assert points.shape == (20, 50, 2)
+    for window, window_points in zip(windows, points):
+        assert np.all(window.indicator_function(window_points))
+
+
+def test_ball_volume_high_dimension():
+    d = 400
+    balls = BallWindowArray(np.zeros((3, d)), np.array([0, 0.1, 10]))
+    volumes = balls.volume()
+    assert volumes[0] == 0
+    assert volumes[1] == 0
+    assert volumes[2] == pytest.approx(BallWindow(np.zeros(d), 10.0).volume())
+    assert BallWindowArray(np.zeros((1, d)), np.array([100.0])).volume()[0] == np.inf